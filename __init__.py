@@ -1,3 +1,23 @@
-from .arrays import *
-from .data import *
-from .graphs import *
\ No newline at end of file
+from .lazy import lazy
+
+__getattr__, __dir__ = lazy(__name__, {
+    'Array': '.arrays',
+    'ArraySet': '.arrays',
+    'LazyArray': '.arrays',
+    'DataConnect': '.data',
+    'DataHandler': '.data',
+    'MetaConfig': '.data',
+    'DataConfig': '.data',
+    'Graph': '.graphs',
+    'DirectedAcyclicGraph': '.graphs',
+    'TreeGraph': '.graphs',
+    'ArrayGraph': '.graphs',
+    'FrozenGraph': '.graphs',
+    'MappedGraph': '.graphs',
+    'SharedGraph': '.graphs',
+    'GraphView': '.graphs',
+    'ConcurrentGraph': '.graphs',
+    'DagEvaluator': '.graphs',
+    'algorithms': '.graphs',
+    'parallel': '.graphs',
+}, submodules=['arrays', 'data', 'graphs'])
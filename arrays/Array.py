@@ -47,18 +47,19 @@ class Array(list):
             return self
 
     def last(self, func=None):
-        if func is None:
-            for element in reversed(self):
+        for element in reversed(self):
+            if func is None or func(element):
                 return element
-        else:
-            return self.keep(func).last()
 
     def first(self, func=None):
-        if func is None:
-            for element in self:
+        for element in self:
+            if func is None or func(element):
                 return element
-        else:
-            return self.keep(func).first()
+
+    def lazy(self):
+        """Return a lazy pipeline over the items, its stages are fused in a single pass (see LazyArray)"""
+        from .LazyArray import LazyArray
+        return LazyArray(self)
 
     def dgroup(self, func):
         group_keys = []
@@ -0,0 +1,101 @@
+from .Array import Array
+
+
+class ArraySet:
+    """
+        ArraySet is an insertion-ordered collection of unique (hashable) items,
+        it's backed by a dict so $.__contains__, $.append and $.remove are O(1).
+        It provides the same methods as Array ($.map, $.keep, $.first, ...), which return Arrays.
+        PS: positional access ($[i], $.index) is still supported but costs O(n).
+    """
+    __slots__ = ('_items',)
+
+    def __init__(self, *items):
+        if len(items) == 1 and hasattr(items[0], '__iter__'):
+            items = items[0]
+        self._items = dict.fromkeys(items)
+
+    def append(self, item):
+        self._items[item] = None
+
+    def extend(self, items):
+        self._items.update(dict.fromkeys(items))
+
+    def remove(self, item):
+        try:
+            del self._items[item]
+        except KeyError:
+            raise ValueError(f"{self.__class__.__name__}.remove(x): x not in {self.__class__.__name__}")
+
+    def discard(self, item):
+        self._items.pop(item, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def index(self, item):
+        for index, element in enumerate(self._items):
+            if element is item or element == item:
+                return index
+        raise ValueError(f"{self.__class__.__name__}.index(x): x not in {self.__class__.__name__}")
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Array(self)[index]
+        if index < 0:
+            index += len(self._items)
+        for position, element in enumerate(self._items):
+            if position == index:
+                return element
+        raise IndexError(f"{self.__class__.__name__} index out of range")
+
+    def __eq__(self, other):
+        """Compare the items in order with a list (or Array) or another ArraySet"""
+        if isinstance(other, ArraySet):
+            return len(self._items) == len(other._items) and all(a == b for a, b in zip(self._items, other._items))
+        if isinstance(other, list):
+            return len(self._items) == len(other) and all(a == b for a, b in zip(self._items, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._items)!r})"
+
+    def toArray(self):
+        return Array(self)
+
+    def sort(self, key, reverse=False):
+        return Array(self).sort(key, reverse=reverse)
+
+    apply = Array.apply
+    flat = Array.flat
+    flatmap = Array.flatmap
+    map = Array.map
+    mapenum = Array.mapenum
+    filter = Array.filter
+    keep = Array.keep
+    lazy = Array.lazy
+    last = Array.last
+    first = Array.first
+    dgroup = Array.dgroup
+    group = Array.group
+    max = Array.max
+    sum = Array.sum
+    len = Array.len
+    zip = Array.zip
+    dict = Array.dict
+    set = Array.set
+    __add__ = Array.__add__
@@ -0,0 +1,117 @@
+import collections
+import functools
+import itertools
+
+from .Array import Array
+
+MISSING = object()
+
+
+class LazyArray:
+    """
+        LazyArray is a lazy pipeline over an iterable, made by Array.lazy (or LazyArray(iterable)) :
+        the stages ($.map, $.keep, $.filter, $.flatmap, $.take, ...) return a new LazyArray without computing anything,
+        the items go through all the stages in a single pass (chained C iterators, no intermediate Array)
+        when the LazyArray is iterated or reduced.
+        --> $.first, $.any & $.take stop at the first items needed, $.count & $.last run in O(1) memory
+        --> $.collect() materializes the items in an Array
+        >>> graph.links.lazy().keep(Link._match(type='argument')).map(Link.getTarget).first()
+        Each iteration restarts from the source, so a LazyArray over a collection can be iterated several times.
+        PS: over a live collection (Node.lazyTargets, ...), the collection must not change while iterating
+    """
+    __slots__ = ('source', 'stages')
+
+    def __init__(self, source=(), stages=()):
+        self.source = source
+        self.stages = stages
+
+    def _then(self, stage):
+        return LazyArray(self.source, self.stages + (stage,))
+
+    def __iter__(self):
+        items = iter(self.source)
+        for stage in self.stages:
+            items = stage(items)
+        return items
+
+    def __bool__(self):
+        """Return True if the pipeline yields at least one item"""
+        return next(iter(self), MISSING) is not MISSING
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.source!r}, {len(self.stages)} stages)"
+
+    def map(self, func):
+        return self._then(functools.partial(map, func))
+
+    def mapenum(self, func):
+        return self._then(lambda items: itertools.starmap(func, enumerate(items)))
+
+    def keep(self, func):
+        return self._then(functools.partial(filter, func))
+
+    def filter(self, func):
+        return self._then(functools.partial(itertools.filterfalse, func))
+
+    def flat(self):
+        return self._then(itertools.chain.from_iterable)
+
+    def flatmap(self, func):
+        return self.map(func).flat()
+
+    def take(self, n):
+        """Keep the n first items (the source is not read further)"""
+        return self._then(lambda items: itertools.islice(items, n))
+
+    def sort(self, key, reverse=False):
+        """Sort the items, this stage reads all the items of the previous stages before yielding the first one"""
+        return self._then(lambda items: iter(sorted(items, key=key, reverse=reverse)))
+
+    def collect(self):
+        """Run the pipeline and return its items as an Array"""
+        return Array(self)
+
+    def apply(self, func):
+        """Run the pipeline and call func on each item"""
+        for item in self:
+            func(item)
+        return self
+
+    def first(self, func=None):
+        """Return the first item (passing func if given), None if there's none, the pipeline stops there"""
+        return next(iter(self) if func is None else filter(func, self), None)
+
+    def last(self, func=None):
+        """Return the last item (passing func if given), None if there's none"""
+        items = collections.deque(self if func is None else filter(func, self), maxlen=1)
+        return items[0] if items else None
+
+    def any(self, func=None):
+        """Return True if an item passes func (or is true if func is None), the pipeline stops at the first one"""
+        return any(self if func is None else map(func, self))
+
+    def count(self, func=None):
+        """Return the number of items (passing func if given), without materializing them"""
+        return sum(1 for _ in (self if func is None else filter(func, self)))
+
+    len = count
+
+    def max(self, default=0):
+        return max(self, default=default)
+
+    def sum(self, default=0):
+        items = iter(self)
+        first = next(items, MISSING)
+        return default if first is MISSING else sum(items, first)
+
+    def group(self, func):
+        return self.collect().group(func)
+
+    def dgroup(self, func):
+        return self.collect().dgroup(func)
+
+    def dict(self):
+        return dict(self)
+
+    def set(self):
+        return set(self)
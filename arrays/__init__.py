@@ -1 +1,7 @@
-from .Array import Array
\ No newline at end of file
+from ..lazy import lazy
+
+__getattr__, __dir__ = lazy(__name__, {
+    'Array': '.Array',
+    'ArraySet': '.ArraySet',
+    'LazyArray': '.LazyArray',
+})
@@ -0,0 +1,77 @@
+import unittest
+
+from .Array import Array
+from .ArraySet import ArraySet
+from .LazyArray import LazyArray
+
+
+class TestArraySet(unittest.TestCase):
+    def test_0001(self):
+        """Test ArraySet insertion order, membership & removal"""
+        items = ArraySet('a', 'b', 'c')
+        items.append('b')
+        items.remove('a')
+
+        self.assertEqual(list(items), ['b', 'c'])
+        self.assertIn('c', items)
+        self.assertNotIn('a', items)
+        self.assertEqual(items.len(), 2)
+        self.assertEqual(items[-1], 'c')
+        self.assertEqual(items.index('c'), 1)
+        self.assertRaises(ValueError, items.remove, 'a')
+
+    def test_0002(self):
+        """Test ArraySet methods shared with Array"""
+        items = ArraySet(range(5))
+
+        self.assertIsInstance(items.map(str), Array)
+        self.assertEqual(items.keep(lambda x: x % 2), [1, 3])
+        self.assertEqual(items.first(lambda x: x > 1), 2)
+        self.assertEqual(items.last(), 4)
+        self.assertEqual(items.sum(), 10)
+        self.assertEqual(items.sort(key=lambda x: -x), [4, 3, 2, 1, 0])
+
+        self.assertTrue(items == ArraySet(range(5)) == Array(range(5)) == [0, 1, 2, 3, 4])
+        self.assertTrue([0, 1, 2, 3, 4] == items and Array(range(5)) == items)
+        self.assertNotEqual(items, ArraySet(reversed(range(5))))
+        self.assertNotEqual(items, [0, 1, 2])
+        self.assertNotEqual(items, {0, 1, 2, 3, 4})
+
+
+class TestLazyArray(unittest.TestCase):
+    def test_0001(self):
+        """Test LazyArray stages & Array.lazy"""
+        items = Array(range(10))
+        pipeline = items.lazy().keep(lambda x: x % 2).map(lambda x: x * 10)
+
+        self.assertIsInstance(pipeline, LazyArray)
+        self.assertEqual(pipeline.collect(), [10, 30, 50, 70, 90])
+        self.assertIsInstance(pipeline.collect(), Array)
+        self.assertEqual(list(pipeline), list(pipeline))
+        self.assertEqual(pipeline.filter(lambda x: x > 50).sort(key=lambda x: -x).collect(), [50, 30, 10])
+        self.assertEqual(Array([1, 2], [3]).lazy().flat().mapenum(lambda i, x: (i, x)).collect(), [(0, 1), (1, 2), (2, 3)])
+        self.assertEqual(items.lazy().flatmap(lambda x: [x] * x).count(), 45)
+        self.assertEqual(ArraySet('abc').lazy().map(str.upper).collect(), ['A', 'B', 'C'])
+        self.assertEqual((pipeline.sum(), pipeline.max(), pipeline.last(), pipeline.len()), (250, 90, 90, 5))
+        self.assertEqual((LazyArray().sum(), LazyArray().first()), (0, None))
+
+    def test_0002(self):
+        """Test LazyArray short-circuits : $.first, $.any, $.take & bool"""
+        seen = []
+
+        def visit(x):
+            seen.append(x)
+            return x
+
+        pipeline = LazyArray(range(100)).map(visit)
+        self.assertEqual(pipeline.first(lambda x: x > 2), 3)
+        self.assertEqual(seen, [0, 1, 2, 3])
+
+        seen.clear()
+        self.assertTrue(pipeline.any(lambda x: x == 1))
+        self.assertEqual(pipeline.take(3).collect(), [0, 1, 2])
+        self.assertEqual(seen, [0, 1, 0, 1, 2])
+        self.assertTrue(pipeline)
+        self.assertFalse(pipeline.keep(lambda x: x < 0).take(0))
+        self.assertEqual(Array(range(5)).first(lambda x: x > 2), 3)
+        self.assertEqual(Array(range(5)).last(lambda x: x < 2), 1)
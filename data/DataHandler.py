@@ -1,4 +1,3 @@
-import json
 import os
 
 
@@ -15,12 +14,13 @@ class DataHandler(dict):
         This class also provides a $.match method, which can be used to know if the keys of data are
         matching given dict(s).
     """
+    __slots__ = ()
 
     def __init__(self, **kwargs):
         f"""{self.__class__.__name__}(**kw) --> initialize the data with **kw"""
         super().__init__()
-        self._data = {}
-        self(**kwargs)
+        if kwargs:
+            self(**kwargs)
 
     def onSet(self, key, val):
         pass
@@ -99,9 +99,14 @@ class DataHandler(dict):
             return self
 
     def toFile(self, filepath):
-        json.dump(self(), open(filepath, mode='w', encoding='utf-8'))
+        """Write the data in a json file, the json is encoded by chunks while written (no intermediate copy)"""
+        import json
+        with open(filepath, mode='w', encoding='utf-8') as fp:
+            json.dump(self, fp)
 
     @classmethod
     def fromFile(cls, filepath):
+        import json
         assert os.path.exists(filepath)
-        return cls(**json.load(open(filepath, mode='r', encoding='utf-8')))
+        with open(filepath, mode='r', encoding='utf-8') as fp:
+            return cls(**json.load(fp))
@@ -55,6 +55,7 @@ class DataConfig:
         This class also provides a $.match method, which can be used to know if the keys of data are
         matching given dict(s).
     """
+    __slots__ = ()
 
     def __init__(self, **kwargs):
         f"""{self.__class__.__name__}(**kw) --> initialize the data with **kw"""
@@ -86,6 +87,7 @@ class MetaConfig:
         the only difference if that the dict is named 'meta' in place of 'data'.
         PS: DataConfig and MetaConfig are made compatible, so they can both be super of the same subclass.
     """
+    __slots__ = ()
 
     def __init__(self, **kwargs):
         self.meta = DataHandler(**kwargs)
@@ -1,3 +1,8 @@
-from .DataConnect import DataConnect
-from .DataHandler import DataHandler
-from .MetaData import MetaConfig, DataConfig
\ No newline at end of file
+from ..lazy import lazy
+
+__getattr__, __dir__ = lazy(__name__, {
+    'DataConnect': '.DataConnect',
+    'DataHandler': '.DataHandler',
+    'MetaConfig': '.MetaData',
+    'DataConfig': '.MetaData',
+})
@@ -1,32 +1,164 @@
+from .DirectedAcyclicGraph import _invalidateLayer, _origins, _targets
 from .TreeGraph import TreeGraph
+from ..arrays import Array
 
 
 class Node(TreeGraph.Node):
-    pass
+    __slots__ = ('_index',)
+
+    def __init__(self, graph, **data):
+        super().__init__(graph, **data)
+        # position in the order index, maintained (lazily) by ArrayGraph
+        self._index = None
+
+    @property
+    def prev(self):
+        """Return the previous node (origin), O(1)"""
+        return self.parent
+
+    @property
+    def next(self):
+        """Return the next node (target), O(1)"""
+        for link in self._targetLinks:
+            return link.target
+
+    @property
+    def index(self):
+        """Return the position of the node in the graph (see ArrayGraph.position)"""
+        return self.graph.position(self)
 
 
 class Link(TreeGraph.Link):
-    def __init__(self, graph, origin, target, **data):
-        assert target.origins.len() > 1, f"{self.graph.__class__.__name__} Nodes can have a maximum of 1 target"
-        super().__init__(graph, origin, target, **data)
+    __slots__ = ()
 
 
 class ArrayGraph(TreeGraph):
     """
         Array Graph represent a structure where nodes are ordonned by layers.
-        Also, each node can have a maximum of 1 origin (called prev_item in this context)
-        Also, each node can have a maximum of 1 target (called next_item in this context)
+        Also, each node can have a maximum of 1 origin (called prev in this context)
+        Also, each node can have a maximum of 1 target (called next in this context)
         Layers can be calculated from the root origin(s) or the root target(s)
+
+        The nodes are indexed by position in an order index (an Array, see $.toArray), so the graph works as a sequence :
+        --> $.at(i), Node.prev & Node.next are O(1), Node.index is O(1) (amortized, positions are renumbered lazily)
+        --> $.append is O(1), $.insert, $.splice & $.pop are O(n) (a shift of the order index, and for $.insert & $.splice,
+            the topological reorder of the following nodes)
+        PS: when there are several chains, they're concatenated in the order of their first node (see TreeGraph.tour),
+            after a change made with the generic methods ($.setLink, $.delLink, ...) the order index is rebuilt that way.
     """
     Node = Node
     Link = Link
 
-
-
-
-
-
-
-
-
-
+    def __init__(self, **meta):
+        super().__init__(**meta)
+        # order index : the nodes by position, None when outdated
+        self.sequence = None
+        # the nodes placed before this position have an up-to-date Node._index
+        self.numbered = 0
+
+    def checkLink(self, origin, target):
+        assert not origin._targetLinks, f"{self.__class__.__name__} Nodes can have a maximum of 1 target"
+        super().checkLink(origin, target)
+
+    def checkLinks(self, links):
+        for link in links:
+            assert len(link.origin._targetLinks) == 1, f"{self.__class__.__name__} Nodes can have a maximum of 1 target"
+        super().checkLinks(links)
+
+    def setLink(self, origin, target, **linkData):
+        # in a chain, raising the cached layers would walk all the previous (or next) nodes on each link,
+        # they're invalidated instead, the walks stop at the nodes already invalidated
+        _invalidateLayer(origin, '_targetLayer', _origins)
+        _invalidateLayer(target, '_originLayer', _targets)
+        return super().setLink(origin, target, **linkData)
+
+    def setLinkOrigin(self, link, origin):
+        assert origin is link.origin or not origin._targetLinks, \
+            f"{self.__class__.__name__} Nodes can have a maximum of 1 target"
+        super().setLinkOrigin(link, origin)
+
+    def _outdate(self):
+        super()._outdate()
+        self.sequence = None
+
+    def _update(self, sequence, index):
+        """Set back the order index once patched by a positional method, the positions change from index"""
+        self.sequence = sequence
+        self.numbered = min(self.numbered, index)
+
+    def toArray(self):
+        """
+            Return the nodes by position, without copy
+            PS: it's the order index itself, so it must not be modified
+        """
+        if self.sequence is None:
+            self.sequence = self.tour()
+            self.numbered = 0
+        return self.sequence
+
+    def at(self, index):
+        """Return the node at the given position, O(1)"""
+        return self.toArray()[index]
+
+    def position(self, node):
+        """Return the position of a node, the positions are renumbered (once) after the positional changes"""
+        sequence = self.toArray()
+        if self.numbered < len(sequence):
+            for index in range(self.numbered, len(sequence)):
+                sequence[index]._index = index
+            self.numbered = len(sequence)
+        return node._index
+
+    def append(self, **data):
+        """Create a node at the end of the sequence, O(1)"""
+        sequence = self.toArray()
+        node = self.setNode(**data)
+        if sequence:
+            self.setLink(sequence[-1], node)
+        sequence.append(node)
+        self._update(sequence, len(sequence) - 1)
+        return node
+
+    def insert(self, index, **data):
+        """Create a node at the given position, O(n)"""
+        return self.splice(index, [data])[0]
+
+    def splice(self, index, records):
+        """
+            Create a chain of nodes from an iterable of data dicts, and insert it at the given position, O(n)
+            --> in the middle of a chain, the link to the node at this position is moved to the last new node
+            --> between two chains, the new nodes join the end of the previous chain
+        """
+        sequence = self.toArray()
+        index = min(max(index + len(sequence) if index < 0 else index, 0), len(sequence))
+        prev = sequence[index - 1] if index > 0 else None
+        current = sequence[index] if index < len(sequence) else None
+
+        nodes = Array(self.setNode(**data) for data in records)
+        if not nodes:
+            return nodes
+        for origin, target in zip(nodes, nodes[1:]):
+            self.setLink(origin, target)
+        if current is not None and current.parent is not None and current.parent is prev:
+            self.setLinkOrigin(next(iter(current._originLinks)), nodes[-1])
+        elif current is not None and (prev is None or prev._targetLinks):
+            self.setLink(nodes[-1], current)
+        if prev is not None and not prev._targetLinks:
+            self.setLink(prev, nodes[0])
+
+        sequence[index:index] = nodes
+        self._update(sequence, index)
+        return nodes
+
+    def pop(self, index=-1):
+        """Delete the node at the given position (the last one by default), its neighbors are linked, and return it"""
+        sequence = self.toArray()
+        node = sequence[index]
+        prev, after = node.prev, node.next
+        self.delNode(node)
+        if prev is not None and after is not None:
+            self.setLink(prev, after)
+        index = index + len(sequence) if index < 0 else index
+        del sequence[index]
+        self._update(sequence, index)
+        return node
@@ -0,0 +1,292 @@
+from array import array
+
+from ..arrays import Array
+from .ItemData import ItemData
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MISSING = object()
+
+
+class Column:
+    """
+        Column stores the values of one data key for all the rows of a ColumnStore,
+        its kind depends on the values it received :
+        --> 'int'    : array('q') of values + bytearray of presence flags
+        --> 'float'  : array('d') of values + bytearray of presence flags
+        --> 'str'    : array('q') of category codes (-1 when missing) + list of the categories
+        --> 'object' : {row: value} dict, fallback for ragged keys (mixed or non scalar types)
+    """
+    __slots__ = ('kind', 'values', 'present', 'categories', 'codes')
+
+    def __init__(self, kind, size):
+        self.kind = kind
+        self.categories = None
+        self.codes = None
+        self.present = None
+        if kind == 'int':
+            self.values = array('q', bytes(8 * size))
+            self.present = bytearray(size)
+        elif kind == 'float':
+            self.values = array('d', bytes(8 * size))
+            self.present = bytearray(size)
+        elif kind == 'str':
+            self.values = array('q', [-1]) * size
+            self.categories = []
+            self.codes = {}
+        else:
+            self.values = {}
+
+    @staticmethod
+    def kindOf(value):
+        return {int: 'int', float: 'float', str: 'str'}.get(type(value), 'object')
+
+    def grow(self):
+        if self.kind == 'str':
+            self.values.append(-1)
+        elif self.kind != 'object':
+            self.values.append(0)
+            self.present.append(0)
+
+    def get(self, row, default=MISSING):
+        if self.kind == 'object':
+            return self.values.get(row, default)
+        elif self.kind == 'str':
+            code = self.values[row]
+            return default if code < 0 else self.categories[code]
+        else:
+            return self.values[row] if self.present[row] else default
+
+    def rows(self):
+        """Return the rows where the column has a value"""
+        if self.kind == 'object':
+            return list(self.values)
+        elif self.kind == 'str':
+            return [row for row, code in enumerate(self.values) if code >= 0]
+        else:
+            return [row for row, flag in enumerate(self.present) if flag]
+
+    def toObject(self):
+        """Convert the column to the 'object' kind"""
+        values = {row: self.get(row) for row in self.rows()}
+        self.kind = 'object'
+        self.values = values
+        self.present = self.categories = self.codes = None
+
+    def set(self, row, value):
+        if self.kind != 'object' and self.kindOf(value) != self.kind:
+            self.toObject()
+        if self.kind == 'object':
+            self.values[row] = value
+        elif self.kind == 'str':
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.categories)
+                self.categories.append(value)
+            self.values[row] = code
+        else:
+            try:
+                self.values[row] = value
+            except OverflowError:
+                self.toObject()
+                self.values[row] = value
+                return
+            self.present[row] = 1
+
+    def delete(self, row):
+        if self.kind == 'object':
+            self.values.pop(row, None)
+        elif self.kind == 'str':
+            self.values[row] = -1
+        else:
+            self.present[row] = 0
+
+    def equals(self, value):
+        """Return the rows where the column value is equal to the given value (vectorized with numpy when available)"""
+        if self.kind == 'object':
+            return [row for row, val in self.values.items() if val == value]
+        elif self.kind == 'str':
+            code = self.codes.get(value) if isinstance(value, str) else None
+            if code is None:
+                return []
+            if numpy is not None:
+                return numpy.flatnonzero(numpy.frombuffer(self.values, dtype=numpy.int64) == code).tolist()
+            return [row for row, val in enumerate(self.values) if val == code]
+        else:
+            if numpy is not None:
+                values = numpy.frombuffer(self.values, dtype=numpy.int64 if self.kind == 'int' else numpy.float64)
+                present = numpy.frombuffer(self.present, dtype=numpy.bool_)
+                return numpy.flatnonzero((values == value) & present).tolist()
+            present = self.present
+            return [row for row, val in enumerate(self.values) if val == value and present[row]]
+
+    def presentValues(self):
+        if self.kind == 'object':
+            return list(self.values.values())
+        return [self.get(row) for row in self.rows()]
+
+
+class ColumnData(ItemData):
+    """
+        ColumnData is the data handler of the items of a graph using a ColumnStore,
+        it's a view on the row of the item in the store (the dict itself stays empty).
+    """
+    __slots__ = ('store', 'row')
+
+    def __init__(self, item, store, row):
+        dict.__init__(self)
+        self.item = item
+        self.shared = False
+        self.store = store
+        self.row = row
+
+    def get(self, key, default=None):
+        column = self.store.columns.get(key)
+        return default if column is None else column.get(self.row, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.store.set(self.row, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.store.columns[key].delete(self.row)
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    def pop(self, key, *default):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self.store.columns[key].delete(self.row)
+        return value
+
+    def keys(self):
+        return [key for key, column in self.store.columns.items() if column.get(self.row) is not MISSING]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def copy(self):
+        return dict(self.items())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class ColumnStore:
+    """
+        ColumnStore stores the data of the nodes (or the links) of a graph by columns, one per data key (see Column),
+        each item has a row in the store and its data handler (ColumnData) is a view on this row.
+        It's made by Graph.useColumns, $.where and the aggregations ($.sum, $.min, ...) scan the columns.
+        PS: the rows of the deleted items are not reused
+    """
+
+    def __init__(self):
+        self.items = []
+        self.columns = {}
+
+    def handler(self, item, data):
+        """Allocate a row for the item, fill it with data (the None values are dropped) and return its data handler"""
+        row = len(self.items)
+        self.items.append(item)
+        for column in self.columns.values():
+            column.grow()
+        for key, value in data.items():
+            if value is not None:
+                self.set(row, key, value)
+        return ColumnData(item, self, row)
+
+    def release(self, row):
+        """Clear the row of a deleted item"""
+        self.items[row] = None
+        for column in self.columns.values():
+            column.delete(row)
+
+    def set(self, row, key, value):
+        """Set the value of the row in the column key, a None value deletes it (as DataHandler does)"""
+        column = self.columns.get(key)
+        if value is None:
+            if column is not None:
+                column.delete(row)
+            return
+        if column is None:
+            column = self.columns[key] = Column(Column.kindOf(value), len(self.items))
+        column.set(row, value)
+
+    def column(self, key):
+        """Return the raw values of a column (array for typed columns, dict for the 'object' ones)"""
+        return self.columns[key].values
+
+    def rows(self, **config):
+        """Return the (sorted) rows of the living items matching all the (key: val) of config"""
+        rows = None
+        for key, val in config.items():
+            column = self.columns.get(key)
+            if val is None:
+                found = set(range(len(self.items))) if column is None else set(range(len(self.items))) - set(column.rows())
+            elif column is None:
+                found = set()
+            else:
+                found = set(column.equals(val))
+            rows = found if rows is None else rows & found
+        if rows is None:
+            rows = range(len(self.items))
+        return [row for row in sorted(rows) if self.items[row] is not None]
+
+    def where(self, **config):
+        """Return the items whose data match all the (key: val) of config, as an Array"""
+        return Array(self.items[row] for row in self.rows(**config))
+
+    def _values(self, key, config):
+        column = self.columns.get(key)
+        if column is None:
+            return []
+        if not config:
+            return [value for row, value in zip(column.rows(), column.presentValues()) if self.items[row] is not None]
+        return [value for value in (column.get(row) for row in self.rows(**config)) if value is not MISSING]
+
+    def count(self, key, **config):
+        """Return the number of (matching) items having a value for key"""
+        return len(self._values(key, config))
+
+    def sum(self, key, **config):
+        return sum(self._values(key, config))
+
+    def min(self, key, **config):
+        return min(self._values(key, config), default=None)
+
+    def max(self, key, **config):
+        return max(self._values(key, config), default=None)
+
+    def mean(self, key, **config):
+        values = self._values(key, config)
+        return sum(values) / len(values) if values else None
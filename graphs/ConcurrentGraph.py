@@ -0,0 +1,55 @@
+import contextlib
+import threading
+
+from .Graph import Graph
+
+
+class ConcurrentGraph:
+    """
+        ConcurrentGraph shares a graph between reader threads and writer threads with snapshot isolation :
+        the writers mutate the graph (the master, only touched by them) in batches, one at a time,
+        and each batch publishes a new snapshot, a clone of the master (see Graph.clone).
+        The readers take the current snapshot with $.snapshot(), without lock, and keep it as long as they need,
+        it's an immutable version of the graph, so they never see a batch half-applied and never wait for the writers.
+        The old snapshots are freed once no reader holds them anymore.
+
+        >>> with concurrent.write() as graph:
+        ...     graph.setLink(graph.getNode(uid), graph.setNode(name='x'))
+        >>> snapshot = concurrent.snapshot()
+
+        The items of the snapshots are not the ones of the master, use the uids to go from one to the other.
+        Publishing a snapshot costs O(V+E) for the structure (the data is shared copy-on-write, see HandlerView),
+        so the writes should be grouped in batches.
+        PS: the snapshots must not be modified
+    """
+
+    def __init__(self, graph=None):
+        self.graph = Graph() if graph is None else graph
+        self.lock = threading.Lock()
+        # (version, snapshot), replaced in a single assignment so the readers always get a consistent pair
+        self.published = (0, self.graph.clone())
+
+    @property
+    def version(self):
+        """Return the number of snapshots published after the first one"""
+        return self.published[0]
+
+    def snapshot(self):
+        """Return the current snapshot of the graph, O(1) and without lock"""
+        return self.published[1]
+
+    def publish(self):
+        """Publish a snapshot of the master, called by $.write at the end of each batch"""
+        version = self.published[0]
+        self.published = (version + 1, self.graph.clone())
+
+    @contextlib.contextmanager
+    def write(self):
+        """
+            Run a batch of writes on the master (given by the context manager), the batches are serialized
+            and the snapshot is published once the batch ends.
+            PS: if the batch raises, nothing is published (the changes already made are published with the next batch)
+        """
+        with self.lock:
+            yield self.graph
+            self.publish()
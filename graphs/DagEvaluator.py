@@ -0,0 +1,128 @@
+from ..arrays import Array
+
+
+def _call(operation, data, arguments):
+    return operation(data, *arguments)
+
+
+class DagEvaluator:
+    """
+        DagEvaluator evaluates the nodes of a DirectedAcyclicGraph, made by DirectedAcyclicGraph.evaluator,
+        each node is computed by the operation of a dispatch table selected by its data (by 'name', else by 'type'),
+        called as operation(data, *arguments) where data is a copy of the node data
+        and the arguments are the values of its origins, ordered by the 'index' of their links.
+
+        >>> evaluator = graph.evaluator({'variable': lambda data: env[data['name']], 'add': lambda data, a, b: a + b})
+        >>> evaluator.evaluate(node)
+
+        The values are cached (by node uid) and the nodes are evaluated layer by layer (see Node.originLayer),
+        the nodes of a layer are independent so they run concurrently when an executor
+        (concurrent.futures ThreadPoolExecutor or ProcessPoolExecutor) is given.
+        The evaluator follows the journal of the graph (see Graph.useJournal) : after data or link changes,
+        only the cached values of the downstream cone of the changed nodes are re-evaluated.
+        If the evaluator enabled the journal, it truncates it after each sync (so it doesn't grow forever),
+        an evaluator whose changes aren't in the journal anymore drops all its cached values.
+        PS: with a ProcessPoolExecutor, the operations must be picklable (module level functions)
+    """
+
+    def __init__(self, graph, operations, keys=('name', 'type'), index='index', executor=None):
+        self.graph = graph
+        self.operations = operations
+        self.keys = keys
+        self.index = index
+        self.executor = executor
+        self.cache = {}
+        # the journal is truncated by the evaluator if it's the one that enabled it
+        self.ownsJournal = graph.journal is None
+        self.version = graph.useJournal().version
+
+    def operation(self, node):
+        """Return the operation of the dispatch table for the node"""
+        for key in self.keys:
+            value = node.getData(key)
+            if value is not None and value in self.operations:
+                return self.operations[value]
+        raise KeyError(f"no operation for the node {node.uid} ({', '.join(self.keys)}: "
+                       f"{', '.join(repr(node.getData(key)) for key in self.keys)})")
+
+    def arguments(self, node):
+        """Return the origins of the node, ordered by the index of their links (insertion order when missing)"""
+        links = sorted(enumerate(node._originLinks), key=lambda item: item[1].getData(self.index, item[0]))
+        return [link.origin for _, link in links]
+
+    def invalidate(self, node):
+        """Drop the cached values of the node and of its downstream cone"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            # the cached nodes are closed upward, so the walk stops at the nodes without value
+            if current.uid in self.cache:
+                del self.cache[current.uid]
+                stack.extend(link.target for link in current._targetLinks)
+
+    def sync(self):
+        """Invalidate the cached values affected by the changes made in the graph since the last sync"""
+        graph = self.graph
+        if self.version < graph.journal.start:
+            self.cache.clear()
+            self.version = graph.version
+        for operation, *args in graph.changesSince(self.version):
+            if operation in ('setData', 'delData'):
+                on, uid = args[0], args[1]
+                item = graph.getNode(uid) if on == 'nodes' else graph.getLink(uid)
+                node = item if on == 'nodes' else item and item.target
+            elif operation in ('addLink', 'delLink'):
+                node = graph.getNode(args[2])
+            elif operation == 'setLinkOrigin':
+                link = graph.getLink(args[0])
+                node = link and link.target
+            elif operation in ('delNode', 'setNodeId'):
+                self.cache.pop(args[0], None)
+                node = None
+            else:
+                node = None
+            if node is not None:
+                self.invalidate(node)
+        self.version = graph.version
+        if self.ownsJournal:
+            graph.journal.truncate(self.version)
+
+    def evaluate(self, *nodes):
+        """
+            Return the value of the given node (or the list of the values of the given nodes),
+            by default the list of the values of all the nodes.
+            Only the nodes needed and not cached yet are evaluated.
+        """
+        self.sync()
+        single = len(nodes) == 1
+        if not nodes:
+            nodes = tuple(self.graph.nodes)
+        cache = self.cache
+        layers = {}
+        stack = [node for node in nodes if node.uid not in cache]
+        seen = set(stack)
+        while stack:
+            node = stack.pop()
+            layers.setdefault(node.originLayer, Array()).append(node)
+            for link in node._originLinks:
+                origin = link.origin
+                if origin not in seen and origin.uid not in cache:
+                    seen.add(origin)
+                    stack.append(origin)
+
+        for layer in sorted(layers):
+            pending = layers[layer]
+            calls = (
+                pending.map(self.operation),
+                pending.map(lambda node: dict(node._data or ())),
+                pending.map(lambda node: [cache[origin.uid] for origin in self.arguments(node)])
+            )
+            if self.executor is not None and len(pending) > 1:
+                values = self.executor.map(_call, *calls)
+            else:
+                values = map(_call, *calls)
+            for node, value in zip(pending, values):
+                cache[node.uid] = value
+
+        values = [cache[node.uid] for node in nodes]
+        return values[0] if single else values
@@ -1,27 +1,102 @@
+from collections import deque
+
+from .DagEvaluator import DagEvaluator
 from .Graph import Graph
-from graphviz import Digraph
+from ..arrays import Array
+
+
+def _origins(node):
+    return (link.origin for link in node._originLinks)
+
+
+def _targets(node):
+    return (link.target for link in node._targetLinks)
+
+
+def _computeLayer(node, attr, parents):
+    """Compute (iteratively) and cache the layer ``attr`` of a node, from the layers of its ``parents``"""
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if getattr(current, attr) is not None:
+            stack.pop()
+            continue
+        pending = [parent for parent in parents(current) if getattr(parent, attr) is None]
+        if pending:
+            stack.extend(pending)
+        else:
+            setattr(current, attr, max((getattr(parent, attr) for parent in parents(current)), default=-1) + 1)
+            stack.pop()
+    return getattr(node, attr)
+
+
+def _raiseLayer(node, layer, attr, children):
+    """Raise the cached layer ``attr`` of a node to ``layer`` and propagate the increase to its cached ``children``"""
+    current = getattr(node, attr)
+    if current is None or current >= layer:
+        return
+    setattr(node, attr, layer)
+    queue = deque([node])
+    while queue:
+        parent = queue.popleft()
+        layer = getattr(parent, attr) + 1
+        for child in children(parent):
+            current = getattr(child, attr)
+            if current is not None and current < layer:
+                setattr(child, attr, layer)
+                queue.append(child)
+
+
+def _freeze(value):
+    """Return a hashable (and type-aware, so 1, 1.0 and True differ) version of a data value, used in structural keys"""
+    if isinstance(value, dict):
+        return dict, frozenset((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(map(_freeze, value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset, frozenset(map(_freeze, value))
+    hash(value)
+    return type(value), value
+
+
+def _invalidateLayer(node, attr, children):
+    """Invalidate the cached layer ``attr`` of a node and of its cone of ``children``"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if getattr(current, attr) is not None:
+            setattr(current, attr, None)
+            stack.extend(children(current))
 
 
 class Node(Graph.Node):
+    __slots__ = ('_originLayer', '_targetLayer', '_position')
+
+    def __init__(self, graph, **data):
+        super().__init__(graph, **data)
+        # cached layers, None when invalidated by a link deletion
+        self._originLayer = 0
+        self._targetLayer = 0
+        # position in the topological order, maintained by DirectedAcyclicGraph
+        self._position = None
+
     @property
     def originLayer(self):
         """Return the layer (starting from origins) of the node"""
-        return self.origins.map(lambda origin: origin.originLayer).max(default=-1)+1
+        if self._originLayer is None:
+            return _computeLayer(self, '_originLayer', _origins)
+        return self._originLayer
 
     @property
     def targetLayer(self):
         """Return the layer (starting from targets) of the node"""
-        return self.targets.map(lambda target: target.targetLayer).max(default=-1)+1
+        if self._targetLayer is None:
+            return _computeLayer(self, '_targetLayer', _targets)
+        return self._targetLayer
 
 
 class Link(Graph.Link):
-    def __init__(self, graph, origin, target, **data):
-        # TODO: Make an OR operator between those two and check if it's right !
-        try:
-            assert origin.originLayer <= target.originLayer or target.originLayer == 0, f"Link origin and target should be ordonned {origin.originLayer} {target.originLayer}"
-        except:
-            assert target.targetLayer <= origin.targetLayer or origin.targetLayer == 0, f"Link origin and target should be ordonned {target.targetLayer} {origin.targetLayer}"
-        super().__init__(graph, origin, target, **data)
+    __slots__ = ()
 
 
 class DirectedAcyclicGraph(Graph):
@@ -33,34 +108,244 @@ class DirectedAcyclicGraph(Graph):
     Node = Node
     Link = Link
 
-    def render(self, filepath, node_text, node_config, link_config,
-               node_uid=lambda node: str(hex(id(node))),
-               link_ignore=lambda link: False,
-               node_ignore=lambda link: False,
-               graph_config=None,
-               engine='dot'):
-        if graph_config is None:
-            graph_config = {}
-        dot = Digraph(engine=engine)
+    def __init__(self, **meta):
+        super().__init__(**meta)
+        # topological order of the nodes (deleted nodes leave None holes until the next compaction)
+        self.order = []
+        # {structural key: node} table of the hash-consing mode (see $.useHashConsing)
+        self.consTable = None
+
+    def setNode(self, **nodeData):
+        node = super().setNode(**nodeData)
+        node._position = len(self.order)
+        self.order.append(node)
+        return node
+
+    def delNode(self, node):
+        super().delNode(node)
+        self.order[node._position] = None
+        if len(self.order) > 2 * len(self.nodes) + 16:
+            self.order = [node for node in self.order if node is not None]
+            for position, node in enumerate(self.order):
+                node._position = position
+
+    def addNodes(self, records, uids=None):
+        nodes = super().addNodes(records, uids)
+        for position, node in enumerate(nodes, len(self.order)):
+            node._position = position
+        self.order.extend(nodes)
+        return nodes
 
-        dot.attr(overlap='false', **graph_config)
+    def checkLink(self, origin, target):
+        super().checkLink(origin, target)
+        acyclic = self.reorder(origin, target)
+        assert acyclic, f"{self.__class__.__name__} can't link these nodes, it would create a cycle"
 
+    def checkLinks(self, links):
+        """Check the acyclicity of the whole graph with a single topological pass, and rebuild the order & layers"""
+        super().checkLinks(links)
+        order = self.layers().flat()
+        acyclic = order.len() == len(self.nodes)
+        if acyclic:
+            self.order = order
+            for position, node in enumerate(order):
+                node._position = position
         for node in self.nodes:
-            if not node_ignore(node):
-                dot.node(node_uid(node), node_text(node), **node_config(node), ordering="out")
+            if not acyclic:
+                node._originLayer = None
+            node._targetLayer = None
+        assert acyclic, f"{self.__class__.__name__} can't add these links, they would create a cycle"
 
-        for link in self.links:
-            if not link_ignore(link) and not node_ignore(link.origin) and not node_ignore(link.target):
-                dot.edge(node_uid(link.origin), node_uid(link.target), **link_config(link))
+    def topologicalOrder(self):
+        """Return an iterator over the nodes in topological order (origins before targets), in O(1)"""
+        return (node for node in self.order if node is not None)
 
-        dot.render(filepath, view=True)
+    def reorder(self, origin, target):
+        """
+            Update the topological order for a new link from origin to target (Pearce-Kelly algorithm),
+            only the nodes placed between target and origin in the current order are visited.
+            Return False (and leave the order unchanged) if the link would create a cycle.
+        """
+        lower, upper = target._position, origin._position
+        if lower > upper:
+            return True
+        if origin is target:
+            return False
 
+        forward, stack = {target}, [target]
+        while stack:
+            for child in _targets(stack.pop()):
+                if child is origin:
+                    return False
+                if child not in forward and child._position < upper:
+                    forward.add(child)
+                    stack.append(child)
 
+        backward, stack = {origin}, [origin]
+        while stack:
+            for parent in _origins(stack.pop()):
+                if parent not in backward and parent._position > lower:
+                    backward.add(parent)
+                    stack.append(parent)
 
+        key = lambda node: node._position
+        nodes = sorted(backward, key=key) + sorted(forward, key=key)
+        positions = sorted(map(key, nodes))
+        for node, position in zip(nodes, positions):
+            node._position = position
+            self.order[position] = node
+        return True
 
+    def setLink(self, origin, target, **linkData):
+        link = super().setLink(origin, target, **linkData)
+        if target._originLayer is not None:
+            _raiseLayer(target, origin.originLayer + 1, '_originLayer', _targets)
+        if origin._targetLayer is not None:
+            _raiseLayer(origin, target.targetLayer + 1, '_targetLayer', _origins)
+        return link
 
+    def delLink(self, link):
+        super().delLink(link)
+        origin, target = link.origin, link.target
+        # the layers can only decrease if the removed link was carrying the maximum
+        if origin._originLayer is None or target._originLayer == origin._originLayer + 1:
+            _invalidateLayer(target, '_originLayer', _targets)
+        if target._targetLayer is None or origin._targetLayer == target._targetLayer + 1:
+            _invalidateLayer(origin, '_targetLayer', _origins)
 
+    def setLinkOrigin(self, link, origin):
+        acyclic = self.reorder(origin, link.target)
+        assert acyclic, f"{self.__class__.__name__} can't move this link, it would create a cycle"
+        oldOrigin = link.origin
+        super().setLinkOrigin(link, origin)
+        _invalidateLayer(link.target, '_originLayer', _targets)
+        _invalidateLayer(oldOrigin, '_targetLayer', _origins)
+        _invalidateLayer(origin, '_targetLayer', _origins)
 
+    @staticmethod
+    def consKey(node, data=None, origins=None):
+        """
+            Return the structural key of a node : its data and its ordered origins (with the data of their links),
+            the origins being identified by their uid. Return None if the data isn't hashable.
+            data and origins ([(origin, linkData), ...]) can be given to compute the key of a node before creating it.
+        """
+        if origins is None:
+            data = node._data or {}
+            origins = [(link.origin, link._data or {}) for link in node._originLinks]
+        try:
+            return _freeze(data), tuple((origin.uid, _freeze(linkData)) for origin, linkData in origins)
+        except TypeError:
+            return None
+
+    def useHashConsing(self):
+        """
+            Enable the hash-consing mode : the nodes made by $.consNode are shared by structure,
+            so building an existing (sub)expression returns the existing node. The existing nodes are registered
+            (the first one of each structure), use $.deduplicate to merge the existing duplicates.
+        """
+        if self.consTable is None:
+            self.consTable = {}
+            for node in self.topologicalOrder():
+                key = self.consKey(node)
+                if key is not None:
+                    self.consTable.setdefault(key, node)
+        return self.consTable
+
+    def consNode(self, *origins, **data):
+        """
+            Return the node with the given data and ordered origins (nodes or (node, linkData) pairs),
+            it's created, with its links, only if there's no such node yet (see $.useHashConsing)
+            >>> graph.consNode(x, (y, {'index': 1}), type='operator', name='add')
+        """
+        assert self.consTable is not None, f"hash-consing is not enabled, see {self.__class__.__name__}.useHashConsing"
+        origins = [origin if isinstance(origin, tuple) else (origin, {}) for origin in origins]
+        key = self.consKey(None, data, origins)
+        node = self.consTable.get(key) if key is not None else None
+        if node is not None and self.hasNode(node) and self.consKey(node) == key:
+            return node
 
+        node = self.setNode(**data)
+        for origin, linkData in origins:
+            self.setLink(origin, node, **linkData)
+        if key is not None:
+            self.consTable[key] = node
+        return node
+
+    def deduplicate(self):
+        """
+            Merge the nodes having the same structure (see $.consKey), bottom-up in topological order, in O(V+E) :
+            the target links of a duplicate are moved to the first node of its structure, then the duplicate is deleted.
+            Return the {duplicate: node} mapping of the merged nodes (the hash-consing table is rebuilt if enabled).
+            PS: the links are moved with $.setLinkOrigin, so the constraints of the subclasses apply (ArrayGraph, ...),
+                if a move fails the nodes merged so far stay merged
+        """
+        for node in self.nodes:
+            node._originLayer = node._targetLayer = None
+        table = {}
+        merged = {}
+        for node in list(self.topologicalOrder()):
+            key = self.consKey(node)
+            if key is None:
+                continue
+            representative = table.setdefault(key, node)
+            if representative is not node:
+                for link in list(node._targetLinks):
+                    self.setLinkOrigin(link, representative)
+                self.delNode(node)
+                merged[node] = representative
+        if self.consTable is not None:
+            self.consTable = table
+        return merged
 
+    def evaluator(self, operations, keys=('name', 'type'), index='index', executor=None):
+        """Return a (caching, incremental) evaluator of the nodes, from a {name or type: operation} table, see DagEvaluator"""
+        return DagEvaluator(self, operations, keys, index, executor)
 
+    def layers(self, fromTargets=False):
+        """
+            Compute the layers of all the nodes in a single topological pass, in O(V+E),
+            and return the nodes grouped by layer (the cached layers of the nodes are refreshed)
+            --> by default the layers start from the root origins (Node.originLayer)
+            --> if fromTargets is True, they start from the root targets (Node.targetLayer)
+        """
+        if fromTargets:
+            attr, inLinks, children = '_targetLayer', '_targetLinks', _origins
+        else:
+            attr, inLinks, children = '_originLayer', '_originLinks', _targets
+
+        degrees = {}
+        queue = deque()
+        for node in self.nodes:
+            degrees[node] = len(getattr(node, inLinks))
+            setattr(node, attr, 0)
+            if not degrees[node]:
+                queue.append(node)
+
+        layers = Array()
+        while queue:
+            node = queue.popleft()
+            layer = getattr(node, attr)
+            while len(layers) <= layer:
+                layers.append(Array())
+            layers[layer].append(node)
+            for child in children(node):
+                setattr(child, attr, max(getattr(child, attr), layer + 1))
+                degrees[child] -= 1
+                if not degrees[child]:
+                    queue.append(child)
+        return layers
+
+    def render(self, filepath, node_text, node_config, link_config,
+               node_uid=lambda node: str(hex(id(node))),
+               link_ignore=lambda link: False,
+               node_ignore=lambda link: False,
+               graph_config=None,
+               engine='dot',
+               **options):
+        """Render the graph with the out-links ordered and without overlaps, see Graph.render for the options"""
+        return super().render(
+            filepath, node_text, lambda node: dict(node_config(node), ordering="out"), link_config,
+            node_uid, link_ignore, node_ignore, engine,
+            graph_config=dict(overlap='false', **(graph_config or {})),
+            **options
+        )
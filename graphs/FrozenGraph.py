@@ -0,0 +1,200 @@
+from array import array
+
+
+def _column(values):
+    """Pack values in a typed array when they are all ints (or all floats), else return them as a list"""
+    if all(type(value) is int for value in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if all(type(value) in (int, float) for value in values):
+        return array('d', values)
+    return values
+
+
+def _view(values):
+    """Return a zero-copy view of a column (memoryview for typed arrays, the list itself otherwise)"""
+    return memoryview(values) if isinstance(values, array) else values
+
+
+class FrozenGraph:
+    """
+        FrozenGraph is an immutable compressed-sparse-row (CSR) snapshot of a Graph, made by $.freeze,
+        nodes are numbered 0..n-1 (in the order of Graph.nodes) and links 0..m-1 (grouped by origin),
+        $.linkOrder keeps the indexes of the links in the order of Graph.links and $.linkUids their uids (see $.toGraph).
+
+        out-links of the node i are the links $.outOffsets[i]..$.outOffsets[i+1] and their targets are in $.outTargets,
+        in-links of the node i are listed in $.inLinks[$.inOffsets[i]..$.inOffsets[i+1]] and their origins in $.inOrigins.
+
+        All the index arrays are contiguous typed arrays (array.array('q')),
+        the methods return zero-copy memoryviews over them, which can be wrapped by numpy.frombuffer.
+        PS: the snapshot doesn't follow the mutations of the graph made after $.freeze
+    """
+
+    def __init__(self, graphClass, meta, nodes, links, outOffsets, outTargets, inOffsets, inOrigins, inLinks):
+        self.graphClass = graphClass
+        self.meta = meta
+        self.nodes = nodes
+        self.links = links
+        self.outOffsets = outOffsets
+        self.outTargets = outTargets
+        self.inOffsets = inOffsets
+        self.inOrigins = inOrigins
+        self.inLinks = inLinks
+        self.indexes = None
+        self.columns = {}
+        # indexes of the links in the order of Graph.links, and uids of the links (None when unknown)
+        self.linkOrder = None
+        self.linkUids = None
+
+    @classmethod
+    def fromGraph(cls, graph):
+        """Build the snapshot of a graph in O(V+E)"""
+        nodes = list(graph.nodes)
+        indexes = {node: index for index, node in enumerate(nodes)}
+
+        links = []
+        outOffsets = array('q', [0])
+        for node in nodes:
+            links.extend(node._targetLinks)
+            outOffsets.append(len(links))
+        outTargets = array('q', [indexes[link.target] for link in links])
+
+        linkIndexes = {link: index for index, link in enumerate(links)}
+        inOffsets = array('q', [0])
+        inLinks = array('q')
+        for node in nodes:
+            inLinks.extend(linkIndexes[link] for link in node._originLinks)
+            inOffsets.append(len(inLinks))
+        inOrigins = array('q', [indexes[links[index].origin] for index in inLinks])
+
+        frozen = cls(graph.__class__, dict(graph.meta), nodes, links, outOffsets, outTargets, inOffsets, inOrigins, inLinks)
+        frozen.indexes = indexes
+        frozen.linkOrder = array('q', [linkIndexes[link] for link in graph.links])
+        frozen.linkUids = array('q', [link.uid for link in links])
+        return frozen
+
+    def __len__(self):
+        return self.nodeCount()
+
+    def nodeCount(self):
+        return len(self.outOffsets) - 1
+
+    def linkCount(self):
+        return len(self.outTargets)
+
+    def nodeUid(self, index):
+        """Return the uid of the node at the given index"""
+        return self.nodes[index].uid
+
+    def linkUid(self, index):
+        """Return the uid of the link at the given index (None if the snapshot doesn't keep them)"""
+        return None if self.linkUids is None else self.linkUids[index]
+
+    def nodeData(self, index):
+        """Return the data (mapping) of the node at the given index"""
+        return self.nodes[index]._data or {}
+
+    def nodeMeta(self, index):
+        """Return the meta (mapping) of the node at the given index"""
+        return self.nodes[index]._meta or {}
+
+    def linkData(self, index):
+        """Return the data (mapping) of the link at the given index"""
+        return self.links[index]._data or {}
+
+    def linkMeta(self, index):
+        """Return the meta (mapping) of the link at the given index"""
+        return self.links[index]._meta or {}
+
+    def index(self, node):
+        """Return the index of a node of the original graph in the snapshot"""
+        if self.indexes is None:
+            self.indexes = {node: index for index, node in enumerate(self.nodes)}
+        return self.indexes[node]
+
+    def node(self, index):
+        """Return the original node at the given index"""
+        return self.nodes[index]
+
+    def degree(self, index):
+        """Return the number of out-links of the node at the given index"""
+        return self.outOffsets[index + 1] - self.outOffsets[index]
+
+    def inDegree(self, index):
+        """Return the number of in-links of the node at the given index"""
+        return self.inOffsets[index + 1] - self.inOffsets[index]
+
+    def targets(self, index):
+        """Return a view on the indexes of the targets of the node at the given index"""
+        return memoryview(self.outTargets)[self.outOffsets[index]:self.outOffsets[index + 1]]
+
+    def origins(self, index):
+        """Return a view on the indexes of the origins of the node at the given index"""
+        return memoryview(self.inOrigins)[self.inOffsets[index]:self.inOffsets[index + 1]]
+
+    def targetLinks(self, index):
+        """Return the range of the indexes of the out-links of the node at the given index"""
+        return range(self.outOffsets[index], self.outOffsets[index + 1])
+
+    def originLinks(self, index):
+        """Return a view on the indexes of the in-links of the node at the given index"""
+        return memoryview(self.inLinks)[self.inOffsets[index]:self.inOffsets[index + 1]]
+
+    def linkColumn(self, key, default=None):
+        """
+            Return the column of the data ``key`` of all the links (indexed like the links of the snapshot),
+            as a view on a typed array if the values are all ints or all floats, as a list otherwise.
+            The column is built on first call and then cached.
+        """
+        if ('links', key, default) not in self.columns:
+            values = [self.linkData(index).get(key, default) for index in range(self.linkCount())]
+            self.columns['links', key, default] = _column(values)
+        return _view(self.columns['links', key, default])
+
+    def nodeColumn(self, key, default=None):
+        """Return the column of the data ``key`` of all the nodes, see $.linkColumn"""
+        if ('nodes', key, default) not in self.columns:
+            values = [self.nodeData(index).get(key, default) for index in range(self.nodeCount())]
+            self.columns['nodes', key, default] = _column(values)
+        return _view(self.columns['nodes', key, default])
+
+    def save(self, path):
+        """Write the snapshot in a binary graph file, which can be memory-mapped (see MappedGraph)"""
+        from .MappedGraph import MappedGraph
+        MappedGraph.write(self, path)
+
+    def toGraph(self, cls=None):
+        """
+            Build a new mutable graph (of the original graph class by default) from the snapshot,
+            keeping the uids, the order of the links and the order of the links of each node
+        """
+        graph = (cls or self.graphClass)(**self.meta)
+        indexes = range(self.nodeCount())
+        nodes = graph.addNodes((dict(self.nodeData(index)) for index in indexes), uids=map(self.nodeUid, indexes))
+        for index, node in enumerate(nodes):
+            meta = self.nodeMeta(index)
+            if meta:
+                dict.update(node.meta, meta)
+
+        origins = array('q', bytes(8 * self.linkCount()))
+        for origin in indexes:
+            for index in self.targetLinks(origin):
+                origins[index] = origin
+        order = range(self.linkCount()) if self.linkOrder is None else self.linkOrder
+        links = graph.addLinks(
+            ((nodes[origins[index]], nodes[self.outTargets[index]], dict(self.linkData(index))) for index in order),
+            uids=None if self.linkUids is None else map(self.linkUid, order)
+        )
+        byIndex = [None] * len(links)
+        for index, link in zip(order, links):
+            byIndex[index] = link
+            meta = self.linkMeta(index)
+            if meta:
+                dict.update(link.meta, meta)
+        # the links of each node are put back in their order in the snapshot
+        for index, node in enumerate(nodes):
+            node._targetLinks = dict.fromkeys(byIndex[link] for link in self.targetLinks(index))
+            node._originLinks = dict.fromkeys(byIndex[link] for link in self.originLinks(index))
+        return graph
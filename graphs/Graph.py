@@ -1,7 +1,20 @@
-from graphviz import Digraph
+import contextlib
+import itertools
+import operator
+import os
+import weakref
 
 from ..data import DataConfig, MetaConfig
-from ..arrays import Array
+from ..data.MetaData import DictInterface
+from ..arrays import Array, ArraySet
+from ..arrays.LazyArray import LazyArray
+from .FrozenGraph import FrozenGraph
+from .GraphIndex import GraphIndex, GraphItemSet
+from .GraphJournal import GraphJournal
+from .GraphView import GraphView
+from .HandlerView import HandlerView
+from .ItemData import ItemData, ItemDataView
+from .ItemMeta import ItemMeta, ItemMetaView
 
 
 def indent(s: str, indent='  ') -> str:
@@ -28,13 +41,63 @@ class GraphItem(DataConfig, MetaConfig):
         GraphItem is a generic class for all Graph contained items,
         it implements both DataConfig and MetaConfig
         and as an item of a graph it stores it's owner graph.
+
+        To keep the items compact, they use __slots__ and their data & meta handlers are allocated
+        on the first access to $.data / $.meta (use $.getData / $.getMeta to read without allocating them).
+        The handlers shared with a clone (see Graph.clone) are read through a view (see HandlerView),
+        allocated on the first access to $.data / $.meta and copying the shared handler on its first write only.
     """
+    __slots__ = ('graph', '_data', '_meta')
 
     def __init__(self, graph, **data):
         assert isinstance(graph, Graph)
         self.graph = graph
-        DataConfig.__init__(self, **data)
-        MetaConfig.__init__(self)
+        self._data = graph.newData(self, data)
+        self._meta = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = ItemData(self)
+        elif self._data.shared:
+            self._data = ItemDataView(self, self._data)
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+    @property
+    def meta(self):
+        if self._meta is None:
+            self._meta = ItemMeta(self)
+        elif self._meta.shared:
+            self._meta = ItemMetaView(self, self._meta)
+        return self._meta
+
+    @meta.setter
+    def meta(self, meta):
+        self._meta = meta
+
+    def getData(self, key, default=None):
+        """Return data[key] (or default if it's missing)"""
+        return default if self._data is None else self._data.get(key, default)
+
+    def getMeta(self, key, default=None):
+        """Return meta[key] (or default if it's missing)"""
+        return default if self._meta is None else self._meta.get(key, default)
+
+    def match(self, *configs, **config):
+        """Implementation of DataConfig.match"""
+        if configs:
+            return DataConfig.match(self, *configs, **config)
+        return all(self.getData(key) == val for key, val in config.items())
+
+    def _dataDict(self):
+        return DictInterface.parse(self._data) if self._data else {}
+
+    def _metaDict(self):
+        return DictInterface.parse(self._meta) if self._meta else {}
 
     @classmethod
     def _match(cls, *configs, **config):
@@ -43,6 +106,16 @@ class GraphItem(DataConfig, MetaConfig):
 
 
 class Node(GraphItem):
+    __slots__ = ('uid', '_targetLinks', '_originLinks')
+
+    def __init__(self, graph, **data):
+        super().__init__(graph, **data)
+        # stable id, assigned by Graph.setNode
+        self.uid = None
+        # adjacency indexes ({link: None}, insertion ordered), maintained by Graph.setLink / Graph.delLink
+        self._targetLinks = {}
+        self._originLinks = {}
+
     def addOrigin(self, origin, **kwargs):
         """Create a link oriented from origin to self in self.graph"""
         assert self.graph.hasNode(origin), "can't link nodes between multiple graphs, try using Graph.copyNode"
@@ -84,17 +157,21 @@ class Node(GraphItem):
     @property
     def targetLinks(self):
         """Return all the links that connect self to its node targets"""
-        return self.graph.links.keep(self.isOriginOf)
+        return Array(self._targetLinks)
 
     @property
     def originLinks(self):
         """Return all the links that connect self to its node origins"""
-        return self.graph.links.keep(self.isTargetOf)
+        return Array(self._originLinks)
 
     @property
     def links(self):
-        """Return all the links of self"""
-        return self.graph.links.keep(self.isVertexOf)
+        """
+            Return all the links of self in O(degree) : the target links then the origin links, each in insertion order
+            (a self-loop is returned once, with the target links).
+            PS: it's not the order of Graph.links anymore, use $.graph.links.keep($.isVertexOf) for it (O(E))
+        """
+        return Array(self._targetLinks) + Array(link for link in self._originLinks if link.origin is not self)
 
     @property
     def targets(self):
@@ -106,6 +183,26 @@ class Node(GraphItem):
         """Return all the nodes connected as origins to self"""
         return self.originLinks.map(Link.getOrigin)
 
+    @property
+    def lazyTargetLinks(self):
+        """Return the links that connect self to its targets as a LazyArray (no copy of the adjacency index)"""
+        return LazyArray(self._targetLinks)
+
+    @property
+    def lazyOriginLinks(self):
+        """Return the links that connect self to its origins as a LazyArray (no copy of the adjacency index)"""
+        return LazyArray(self._originLinks)
+
+    @property
+    def lazyTargets(self):
+        """Return the targets of self as a LazyArray, see $.lazyTargetLinks"""
+        return LazyArray(self._targetLinks).map(_getTarget)
+
+    @property
+    def lazyOrigins(self):
+        """Return the origins of self as a LazyArray, see $.lazyOriginLinks"""
+        return LazyArray(self._originLinks).map(_getOrigin)
+
     def dict_id(self):
         """
             Method that return the id of a node in the graph, used for the $.toDict method
@@ -117,18 +214,21 @@ class Node(GraphItem):
                 (3) preferable to make ids typed as str or int ..
 
             example of values :
-            --> self.graph.nodes.index(self)
+            --> self.uid (default, O(1) and stable through deletions)
             --> id(self)
             --> hex(id(self))
         """
-        return self.graph.nodes.index(self)
+        return self.uid
 
-    def toDict(self):
-        """Implementation of DictInterface.toDict"""
+    def toDict(self, ids=None):
+        """
+            Implementation of DictInterface.toDict
+            if ids is given, it's used as a {node: id} mapping in place of $.dict_id
+        """
         return {
-            '#': self.dict_id(),
-            'meta': MetaConfig.toDict(self),
-            'data': DataConfig.toDict(self)
+            '#': self.dict_id() if ids is None else ids[self],
+            'meta': self._metaDict(),
+            'data': self._dataDict()
         }
 
     def copy(self, newGraph=None, data=True, meta=True, original='copiedFrom'):
@@ -143,13 +243,13 @@ class Node(GraphItem):
         if newGraph is None:
             newGraph = self.graph
         assert isinstance(newGraph, Graph)
-        if data:
-            copy = newGraph.setNode(**self.data())
+        if data and self._data:
+            copy = newGraph.setNode(**self._data)
         else:
             copy = newGraph.setNode()
 
-        if meta:
-            copy.meta(**self.meta())
+        if meta and self._meta:
+            copy.meta(**self._meta)
 
         if original is not None:
             copy.meta(original, self)
@@ -158,15 +258,16 @@ class Node(GraphItem):
 
 
 class Link(GraphItem):
+    __slots__ = ('uid', 'origin', 'target')
+
     def __init__(self, graph, origin, target, **data):
-        assert isinstance(graph, Graph)
         assert origin in graph.nodes
         assert target in graph.nodes
-        self.graph = graph
+        # stable id, assigned by Graph.setLink
+        self.uid = None
         self.origin = origin
         self.target = target
-        DataConfig.__init__(self, **data)
-        MetaConfig.__init__(self)
+        super().__init__(graph, **data)
 
     def getOrigin(self):
         return self.origin
@@ -194,27 +295,33 @@ class Link(GraphItem):
             --> the originals origin/target will not be set in new origin/target nodes as copy
         """
 
-        if data:
-            copy = newOrigin.addTarget(newTarget, **self.data())
+        if data and self._data:
+            copy = newOrigin.addTarget(newTarget, **self._data)
         else:
             copy = newOrigin.addTarget(newTarget)
 
-        if meta:
-            copy.meta(**self.meta())
+        if meta and self._meta:
+            copy.meta(**self._meta)
 
         if original is not None:
             copy.meta(original, self)
 
         return copy
 
-    def toDict(self):
-        """Implementation of DictInterface.toDict"""
-        return {
-            '#origin': self.origin.dict_id(),
-            '#target': self.target.dict_id(),
-            'meta': MetaConfig.toDict(self),
-            'data': DataConfig.toDict(self)
+    def toDict(self, ids=None):
+        """
+            Implementation of DictInterface.toDict
+            if ids is given, it's used as a {node: id} mapping in place of Node.dict_id (and the link uid is omitted)
+        """
+        d = {
+            '#origin': self.origin.dict_id() if ids is None else ids[self.origin],
+            '#target': self.target.dict_id() if ids is None else ids[self.target],
+            'meta': self._metaDict(),
+            'data': self._dataDict()
         }
+        if ids is None:
+            d['#'] = self.uid
+        return d
 
 
 class Graph(MetaConfig):
@@ -236,8 +343,18 @@ class Graph(MetaConfig):
 
     def __init__(self, **meta):
         MetaConfig.__init__(self, **meta)
-        self.nodes = Array()
-        self.links = Array()
+        self.nodes = GraphItemSet(self, 'nodes')
+        self.links = GraphItemSet(self, 'links')
+        self.indexes = {'nodes': {}, 'links': {}}
+        self.columns = {'nodes': None, 'links': None}
+        self.nodesById = {}
+        self.nextNodeId = 0
+        self.linksById = {}
+        self.nextLinkId = 0
+        self.journal = None
+        # weak reference to the graph this graph is cloned from, and its (nextNodeId, nextLinkId) then
+        self.cloneOf = None
+        self.cloneIds = None
 
     def hasNode(self, node):
         """Return True is the node is in the graph"""
@@ -247,76 +364,621 @@ class Graph(MetaConfig):
         """Return True is the link is in the graph"""
         return link in self.links
 
+    def getNode(self, uid):
+        """Return the node of the graph with the given uid (None if there's no such node)"""
+        return self.nodesById.get(uid)
+
+    def getLink(self, uid):
+        """Return the link of the graph with the given uid (None if there's no such link)"""
+        return self.linksById.get(uid)
+
     def setNode(self, **nodeData):
         """Create a new Node in the graph, from it's data"""
         node = self.__class__.Node(self, **nodeData)
         self.nodes.append(node)
+        self.setNodeId(node, self.nextNodeId)
+        if self.indexes['nodes']:
+            self.indexItem('nodes', node)
+        if self.journal is not None:
+            self.journal.append(('addNode', node.uid, dict(node._data or ()), {}))
         return node
 
+    def setNodeId(self, node, uid):
+        """Set the uid of a node of the graph, uids are never reused once assigned"""
+        assert isinstance(uid, int) and self.nodesById.get(uid, node) is node, f"invalid or already used node uid {uid!r}"
+        if self.journal is not None and node.uid is not None and node.uid != uid:
+            self.journal.append(('setNodeId', node.uid, uid))
+        self.nodesById.pop(node.uid, None)
+        node.uid = uid
+        self.nodesById[uid] = node
+        self.nextNodeId = max(self.nextNodeId, uid + 1)
+
+    def setLinkId(self, link, uid):
+        """Set the uid of a link of the graph, uids are never reused once assigned"""
+        assert isinstance(uid, int) and self.linksById.get(uid, link) is link, f"invalid or already used link uid {uid!r}"
+        self.linksById.pop(link.uid, None)
+        link.uid = uid
+        self.linksById[uid] = link
+        self.nextLinkId = max(self.nextLinkId, uid + 1)
+
     def setLink(self, origin, target, **linkData):
         """Create a new Link in the graph, from it's origin node, target node, and data"""
         assert self.hasNode(origin), f"can't make a link in a graph if the node is not in this graph"
         assert self.hasNode(target), f"can't make a link in a graph if the node is not in this graph"
+        self.checkLink(origin, target)
         link = self.__class__.Link(self, origin, target, **linkData)
         self.links.append(link)
+        self.setLinkId(link, self.nextLinkId)
+        origin._targetLinks[link] = None
+        target._originLinks[link] = None
+        if self.indexes['links']:
+            self.indexItem('links', link)
+        if self.journal is not None:
+            self.journal.append(('addLink', link.uid, origin.uid, target.uid, dict(link._data or ()), {}))
         return link
 
+    def setLinkOrigin(self, link, origin):
+        """Move a link to a new origin node, the link keeps its uid, its data and its place among the origin links of its target"""
+        assert self.hasLink(link) and self.hasNode(origin)
+        del link.origin._targetLinks[link]
+        link.origin = origin
+        origin._targetLinks[link] = None
+        if self.journal is not None:
+            self.journal.append(('setLinkOrigin', link.uid, origin.uid))
+
+    def checkLink(self, origin, target):
+        """Assert the constraints of the graph before linking origin to target, redefined in subclasses"""
+        pass
+
+    def checkLinks(self, links):
+        """Assert the constraints of the graph once a batch of links is added (see $.addLinks), redefined in subclasses"""
+        pass
+
+    def addNodes(self, records, uids=None):
+        """
+            Create nodes in bulk from an iterable of data dicts, and return them as an Array
+            --> the data dicts are stored without going through the DataHandler hooks (the None values are dropped)
+            --> if uids is given, it's an iterable of the (unused) uids to give to the nodes
+        """
+        Node = self.__class__.Node
+        nodes = Array()
+        store = self.columns['nodes']
+        if uids is None:
+            uids = itertools.count(self.nextNodeId)
+        nextNodeId = self.nextNodeId
+        for data, uid in zip(records, uids):
+            assert uid not in self.nodesById, f"node uid {uid!r} is already used"
+            data = _dropNone(data)
+            node = Node(self)
+            if store is not None:
+                node._data.update(data)
+            elif data:
+                node._data = ItemData(node)
+                dict.update(node._data, data)
+            node.uid = uid
+            self.nodesById[uid] = node
+            nodes.append(node)
+            if uid >= nextNodeId:
+                nextNodeId = uid + 1
+        self.nextNodeId = nextNodeId
+        self.nodes.extend(nodes)
+        if self.indexes['nodes']:
+            nodes.apply(lambda node: self.indexItem('nodes', node))
+        if self.journal is not None:
+            self.journal.changes.extend(('addNode', node.uid, dict(node._data or ()), {}) for node in nodes)
+        return nodes
+
+    def addLinks(self, triples, uids=None):
+        """
+            Create links in bulk from an iterable of (origin, target) or (origin, target, data) tuples,
+            and return them as an Array.
+            The nodes & uids are checked before adding any link, and the constraints of the graph are asserted once
+            for the whole batch (see $.checkLinks), if they fail none of the links is added.
+            --> the data dicts are stored without going through the DataHandler hooks (the None values are dropped)
+            --> if uids is given, it's an iterable of the (unused) uids to give to the links
+        """
+        Link = self.__class__.Link
+        links = Array()
+        store = self.columns['links']
+        if uids is None:
+            uids = itertools.count(self.nextLinkId)
+        batch = [(tuple(triple), uid) for triple, uid in zip(triples, uids)]
+        used = set()
+        for (origin, target, *_), uid in batch:
+            assert self.hasNode(origin), f"can't make a link in a graph if the node is not in this graph"
+            assert self.hasNode(target), f"can't make a link in a graph if the node is not in this graph"
+            assert uid not in self.linksById and uid not in used, f"link uid {uid!r} is already used"
+            used.add(uid)
+        for (origin, target, *data), uid in batch:
+            data = [_dropNone(data[0])] if data else data
+            link = Link(self, origin, target)
+            if store is not None and data:
+                link._data.update(data[0])
+            elif data and data[0]:
+                link._data = ItemData(link)
+                dict.update(link._data, data[0])
+            link.uid = uid
+            self.linksById[uid] = link
+            self.nextLinkId = max(self.nextLinkId, uid + 1)
+            origin._targetLinks[link] = None
+            target._originLinks[link] = None
+            links.append(link)
+        self.links.extend(links)
+        try:
+            self.checkLinks(links)
+        except AssertionError:
+            journal, self.journal = self.journal, None
+            links.apply(lambda link: Graph.delLink(self, link))
+            self.journal = journal
+            raise
+        if self.indexes['links']:
+            links.apply(lambda link: self.indexItem('links', link))
+        if self.journal is not None:
+            self.journal.changes.extend(
+                ('addLink', link.uid, link.origin.uid, link.target.uid, dict(link._data or ()), {}) for link in links
+            )
+        return links
+
     def delNode(self, node):
         assert self.hasNode(node)
+        node.links.apply(self.delLink)
+        if self.indexes['nodes']:
+            self.unindexItem('nodes', node)
         self.nodes.remove(node)
-        node.links.apply(lambda link: self.delLink(link))
+        del self.nodesById[node.uid]
+        if self.columns['nodes'] is not None:
+            self.columns['nodes'].release(node._data.row)
+        if self.journal is not None:
+            self.journal.append(('delNode', node.uid))
         del node
 
     def delLink(self, link):
         assert self.hasLink(link)
+        if self.indexes['links']:
+            self.unindexItem('links', link)
         self.links.remove(link)
+        del self.linksById[link.uid]
+        if self.columns['links'] is not None:
+            self.columns['links'].release(link._data.row)
+        del link.origin._targetLinks[link]
+        del link.target._originLinks[link]
+        if self.journal is not None:
+            self.journal.append(('delLink', link.uid, link.origin.uid, link.target.uid))
         del link
 
-    def toDict(self):
-        """Implementation of DictInterface.toDict"""
+    def newData(self, item, data):
+        """Return the data handler of a new item of the graph (None if it has no data and no column store is used)"""
+        store = self.columns['links' if isinstance(item, Link) else 'nodes']
+        if store is not None:
+            return store.handler(item, data)
+        return ItemData(item, **data) if data else None
+
+    def useColumns(self, on='nodes'):
+        """
+            Store the data of the nodes (on='nodes') or links (on='links') of the graph by columns (see ColumnStore),
+            the data of the existing items is moved to the store, and their data handlers become views on it.
+            $.nodes.where / $.links.where then scan the columns, and the store provides aggregations :
+            >>> graph.useColumns('nodes').sum('index', type='operator')
+        """
+        assert on in ('nodes', 'links')
+        if self.columns[on] is None:
+            from .ColumnStore import ColumnStore
+            store = self.columns[on] = ColumnStore()
+            for item in getattr(self, on):
+                item._data = store.handler(item, item._data or {})
+        return self.columns[on]
+
+    def createIndex(self, key, on='nodes'):
+        """
+            Create a hash index of the nodes (on='nodes') or links (on='links') by the value of their data ``key``,
+            the index is kept up to date and used by $.nodes.where / $.links.where for the equality conditions on ``key``
+        """
+        assert on in ('nodes', 'links')
+        if key not in self.indexes[on]:
+            index = self.indexes[on][key] = GraphIndex(key)
+            for item in getattr(self, on):
+                index.add(item, item.getData(key))
+        return self.indexes[on][key]
+
+    def dropIndex(self, key, on='nodes'):
+        """Remove the index created by $.createIndex"""
+        self.indexes[on].pop(key, None)
+
+    def indexItem(self, on, item):
+        for key, index in self.indexes[on].items():
+            index.add(item, item.getData(key))
+
+    def unindexItem(self, on, item):
+        for key, index in self.indexes[on].items():
+            index.discard(item, item.getData(key))
+
+    def onItemData(self, item, key, old, new):
+        """Called by the ItemData of the items of the graph when their data changes, update the indexes and the journal"""
+        on = 'links' if isinstance(item, Link) else 'nodes'
+        index = self.indexes[on].get(key)
+        if index is not None and old is not new and item in getattr(self, on):
+            index.discard(item, old)
+            index.add(item, new)
+        if self.journal is not None and item in getattr(self, on):
+            self.journal.append(('delData', on, item.uid, key) if new is None else ('setData', on, item.uid, key, new))
+
+    def onItemMeta(self, item, key, new):
+        """Called by the ItemMeta of the items of the graph when their meta changes, update the journal"""
+        on = 'links' if isinstance(item, Link) else 'nodes'
+        if self.journal is not None and item in getattr(self, on):
+            self.journal.append(('delMeta', on, item.uid, key) if new is None else ('setMeta', on, item.uid, key, new))
+
+    def useJournal(self):
+        """
+            Record the mutations of the graph from now on in a journal (see GraphJournal),
+            a replica made from the current state of the graph (with the same uids, see $.toDict & $.fromDict)
+            then catches up with $.applyChanges($.changesSince(version)).
+        """
+        if self.journal is None:
+            self.journal = GraphJournal()
+        return self.journal
+
+    @property
+    def version(self):
+        """Return the number of changes recorded in the journal of the graph"""
+        return self.journal.version
+
+    def changesSince(self, version):
+        """Return the changes recorded after version, see GraphJournal"""
+        return self.journal.since(version)
+
+    def applyChanges(self, changes):
+        """
+            Apply a batch of changes recorded by the journal of another graph (see $.changesSince), in O(changes),
+            the changes can come as lists (after a round trip through json for example).
+        """
+        for operation, *args in changes:
+            if operation == 'addNode':
+                uid, data, meta = args
+                node, = self.addNodes([data], uids=[uid])
+                if meta:
+                    node.meta(**meta)
+            elif operation == 'delNode':
+                self.delNode(self.nodesById[args[0]])
+            elif operation == 'addLink':
+                uid, origin, target, data, meta = args
+                # replayed through setLink (with the given uid), to use the incremental checks of the subclasses
+                assert uid not in self.linksById, f"link uid {uid!r} is already used"
+                nextLinkId, self.nextLinkId = self.nextLinkId, uid
+                try:
+                    link = self.setLink(self.nodesById[origin], self.nodesById[target], **data)
+                finally:
+                    self.nextLinkId = max(nextLinkId, self.nextLinkId)
+                if meta:
+                    link.meta(**meta)
+            elif operation == 'delLink':
+                self.delLink(self.linksById[args[0]])
+            elif operation == 'setLinkOrigin':
+                self.setLinkOrigin(self.linksById[args[0]], self.nodesById[args[1]])
+            elif operation == 'setNodeId':
+                self.setNodeId(self.nodesById[args[0]], args[1])
+            else:
+                on, uid, key, *val = args
+                item = (self.nodesById if on == 'nodes' else self.linksById)[uid]
+                handler = item.data if operation.endswith('Data') else item.meta
+                handler(key, val[0] if val else None)
+
+    def view(self, nodeFilter=None, linkFilter=None):
+        """Return a read-only view of the nodes passing nodeFilter and the links passing linkFilter, see GraphView"""
+        return GraphView(self, nodeFilter, linkFilter)
+
+    def subgraph(self, items, induced=True):
+        """
+            Return a read-only view of the given nodes (and the origins & targets of the given links), see GraphView
+            --> if induced is True (by default), the view has all the links between these nodes
+            --> else, it has only the given links
+        """
+        return GraphView.select(self, items, induced)
+
+    def clone(self, nodes=None, links=()):
+        """
+            Return a copy of the graph (same class, meta, uids and indexes), only the structure is copied (O(V+E)) :
+            the data & meta handlers of the items are shared by the graph and the clone (copy-on-write)
+            until their first write on either side (see HandlerView, the reads never copy),
+            so a what-if analysis on a clone costs memory for the touched items only.
+            The clone keeps a weak reference to the graph, see $.provenance
+            --> if nodes are given, only those are cloned, with the given links (see GraphView.clone)
+            PS: the data stored by columns (see $.useColumns) are copied
+        """
+        if nodes is None:
+            nodes, links = self.nodes, self.links
+        nodes, links = Array(nodes), Array(links)
+        clone = self.__class__(**self.meta)
+        clone.cloneOf = weakref.ref(self)
+        clone.cloneIds = (self.nextNodeId, self.nextLinkId)
+
+        copies = clone.addNodes(({} for _ in nodes), [node.uid for node in nodes])
+        triples = [(clone.nodesById[link.origin.uid], clone.nodesById[link.target.uid]) for link in links]
+        copies.extend(clone.addLinks(triples, [link.uid for link in links]))
+        for item, copy in zip(nodes + links, copies):
+            copy._data = _share(item._data, ItemData, copy)
+            copy._meta = _share(item._meta, ItemMeta, copy)
+
+        clone.nextNodeId, clone.nextLinkId = self.nextNodeId, self.nextLinkId
+        for on in ('nodes', 'links'):
+            for key in self.indexes[on]:
+                clone.createIndex(key, on)
+        return clone
+
+    def provenance(self, item):
+        """Return the item the given item is cloned from (see $.clone), None if it's new or the original is gone"""
+        source = self.cloneOf and self.cloneOf()
+        if source is None:
+            return None
+        if isinstance(item, Link):
+            return source.getLink(item.uid) if item.uid < self.cloneIds[1] else None
+        return source.getNode(item.uid) if item.uid < self.cloneIds[0] else None
+
+    def freeze(self):
+        """Return an immutable compressed-sparse-row snapshot of the graph (see FrozenGraph)"""
+        return FrozenGraph.fromGraph(self)
+
+    def save(self, path):
+        """Write the graph in a binary graph file (see MappedGraph)"""
+        self.freeze().save(path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+            Read a binary graph file written by $.save,
+            with mmap=True the file is memory-mapped and returned as a read-only MappedGraph (O(1), lazy decoding),
+            with mmap=False a mutable graph of this class is rebuilt from the file (uids are kept).
+        """
+        from .MappedGraph import MappedGraph
+        if mmap:
+            return MappedGraph.open(path, graphClass=cls)
+        with MappedGraph.open(path, graphClass=cls, mmap=False) as mapped:
+            return mapped.toGraph()
+
+    def _ids(self, compact):
+        return {node: index for index, node in enumerate(self.nodes)} if compact else None
+
+    def iterRecords(self, compact=False):
+        """
+            Yield the records of the graph one by one (see $.fromRecords) :
+            the meta record first, then the node records and the link records.
+            if compact is True, the nodes are renumbered densely (0, 1, 2, ...) in the output
+        """
+        ids = self._ids(compact)
+        yield {'meta': MetaConfig.toDict(self)}
+        for node in self.nodes:
+            yield node.toDict(ids)
+        for link in self.links:
+            yield link.toDict(ids)
+
+    def writeJsonl(self, file, compact=False, compress=None, chunkSize=1024):
+        """
+            Write the records of the graph in a JSON Lines file (one record per line), with a bounded memory,
+            the lines are written by chunks of chunkSize records through a buffered writer.
+            file can be a path or a text file object, if compress is True (default: path ends with '.gz') the file is gzipped.
+            Return the number of records written
+        """
+        import json
+        count = 0
+        with _openText(file, 'w', compress) as fp:
+            chunk = []
+            for count, record in enumerate(self.iterRecords(compact), 1):
+                chunk.append(json.dumps(record))
+                if len(chunk) == chunkSize:
+                    fp.write('\n'.join(chunk) + '\n')
+                    chunk.clear()
+            if chunk:
+                fp.write('\n'.join(chunk) + '\n')
+        return count
+
+    @classmethod
+    def readJsonl(cls, file, compress=None):
+        """Build a graph from a JSON Lines file written by $.writeJsonl, reading it line by line (see $.fromRecords)"""
+        import json
+        with _openText(file, 'r', compress) as fp:
+            return cls.fromRecords(json.loads(line) for line in fp if line.strip())
+
+    def toDict(self, compact=False):
+        """
+            Implementation of DictInterface.toDict
+            if compact is True, the nodes are renumbered densely (0, 1, 2, ...) in the output
+        """
+        ids = self._ids(compact)
         return {
             'meta': MetaConfig.toDict(self),
-            'nodes': list(self.nodes.map(lambda node: node.toDict())),
-            'links': list(self.links.map(lambda link: link.toDict()))
+            'nodes': list(self.nodes.map(lambda node: node.toDict(ids))),
+            'links': list(self.links.map(lambda link: link.toDict(ids)))
         }
 
     @classmethod
     def fromDict(cls, d):
         """Implementation of DictInterface.fromDict"""
-        g = cls(**d.get('meta', {}))
-
-        for nodeData in d.get('nodes', []):
-            node = g.setNode(**nodeData.get('data', {}))
-            node.meta(**nodeData.get('meta', {}))
-            node.meta('#', nodeData.get('#'))
-
-        for linkData in d.get('links', []):
-            origin_id = linkData.get('#origin')
-            target_id = linkData.get('#target')
-
-            origin = g.nodes.first(lambda node: node.meta('#') == origin_id)
-            target = g.nodes.first(lambda node: node.meta('#') == target_id)
+        return cls.fromRecords(itertools.chain(d.get('nodes', []), d.get('links', [])), **d.get('meta', {}))
 
-            link = g.setLink(origin, target, **linkData.get('data'))
-            link.meta(**linkData.get('meta', {}))
+    @classmethod
+    def fromRecords(cls, records, **meta):
+        """
+            Build a graph from an iterable of records, consumed in a single pass in O(N+E) :
+            --> {'#': id, 'meta': {...}, 'data': {...}}                        is a node
+            --> {'#origin': id, '#target': id, 'meta': {...}, 'data': {...}}   is a link
+            --> {'meta': {...}}                                                 updates the graph meta
+            a link record must come after the records of its origin and target nodes.
+            The records can be streamed, for example from a file with one JSON object per line :
+            >>> Graph.fromRecords(map(json.loads, open('graph.jsonl')))
+        """
+        g = cls(**meta)
+        nodes = {}
+        # uids auto-assigned to the items without an int id, they're moved if a later record claims them
+        autoNodeIds, autoLinkIds = set(), set()
+
+        for record in records:
+            if '#origin' in record:
+                link = g.setLink(nodes[record['#origin']], nodes[record['#target']], **record.get('data', {}))
+                if record.get('meta'):
+                    link.meta(**record['meta'])
+                if isinstance(record.get('#'), int):
+                    uid = record['#']
+                    if uid in autoLinkIds and g.linksById[uid] is not link:
+                        autoLinkIds.discard(uid)
+                        autoLinkIds.add(g.nextLinkId)
+                        g.setLinkId(g.linksById[uid], g.nextLinkId)
+                    g.setLinkId(link, uid)
+                    autoLinkIds.discard(uid)
+                else:
+                    autoLinkIds.add(link.uid)
+            elif '#' in record:
+                node = g.setNode(**record.get('data', {}))
+                if record.get('meta'):
+                    node.meta(**record['meta'])
+                if isinstance(record['#'], int):
+                    uid = record['#']
+                    if uid in autoNodeIds and g.nodesById[uid] is not node:
+                        autoNodeIds.discard(uid)
+                        autoNodeIds.add(g.nextNodeId)
+                        g.setNodeId(g.nodesById[uid], g.nextNodeId)
+                    g.setNodeId(node, uid)
+                    autoNodeIds.discard(uid)
+                else:
+                    autoNodeIds.add(node.uid)
+                nodes[record['#']] = node
+            else:
+                g.meta(**record.get('meta', {}))
 
         return g
 
+    def writeDot(self, file, node_text, node_config, link_config,
+                 node_uid=lambda node: str(hex(id(node))),
+                 link_ignore=lambda link: False,
+                 node_ignore=lambda node: False,
+                 graph_config=None,
+                 nodes=None):
+        """
+            Write the graph in the DOT language (graphviz) in O(V+E), node by node and link by link,
+            file can be a path or a text file object.
+            if nodes is given, only these nodes (and the links between them) are written
+        """
+        if nodes is None:
+            nodes = self.nodes
+            links = self.links
+        else:
+            nodes = ArraySet(nodes)
+            links = (link for node in nodes for link in node._targetLinks if link.target in nodes)
+
+        with _openText(file, 'w') as fp:
+            fp.write('digraph {\n')
+            if graph_config:
+                fp.write(f'\tgraph{_dotAttrs(graph_config)}\n')
+            for node in nodes:
+                if not node_ignore(node):
+                    fp.write(f'\t{_dotId(node_uid(node))}{_dotAttrs(dict(label=node_text(node), **node_config(node)))}\n')
+            for link in links:
+                if not link_ignore(link) and not node_ignore(link.origin) and not node_ignore(link.target):
+                    origin, target = _dotId(node_uid(link.origin)), _dotId(node_uid(link.target))
+                    fp.write(f'\t{origin} -> {target}{_dotAttrs(link_config(link))}\n')
+            fp.write('}\n')
+
     def render(self, filepath, node_text, node_config, link_config,
                node_uid=lambda node: str(hex(id(node))),
                link_ignore=lambda link: False,
                node_ignore=lambda link: False,
-               engine='dot'):
-        dot = Digraph(engine=engine)
+               engine='dot',
+               graph_config=None,
+               format='pdf',
+               view=False,
+               around=None,
+               hops=1,
+               sample=None,
+               seed=0):
+        """
+            Write the DOT source of the graph in filepath (see $.writeDot) and render it with graphviz (imported lazily),
+            if view is True, the rendered file is opened with the default viewer.
+            To render a region of a large graph :
+            --> around : node (or nodes) whose neighborhood of ``hops`` links (in both directions) is rendered
+            --> sample : maximum number of nodes, when the graph is bigger a random sample of them is rendered
+            Return the path of the rendered file
+        """
+        nodes = None
+        if around is not None:
+            from .algorithms import neighborhood
+            nodes = neighborhood(around, hops)
+        elif sample is not None and len(self.nodes) > sample:
+            import random
+            nodes = random.Random(seed).sample(list(self.nodes), sample)
 
-        for node in self.nodes:
-            if not node_ignore(node):
-                dot.node(node_uid(node), node_text(node), **node_config(node))
+        self.writeDot(filepath, node_text, node_config, link_config, node_uid, link_ignore, node_ignore,
+                      graph_config, nodes)
 
-        for link in self.links:
-            if not link_ignore(link) and not node_ignore(link.origin) and not node_ignore(link.target):
-                dot.edge(node_uid(link.origin), node_uid(link.target), **link_config(link))
-        dot.render(filepath, view=True)
+        import graphviz
+        output = graphviz.render(engine, format, filepath)
+        if view:
+            graphviz.view(output)
+        return output
+
+
+_getOrigin = operator.attrgetter('origin')
+_getTarget = operator.attrgetter('target')
+
+
+def _dropNone(data):
+    """Return the data without its None values (as the DataHandler does), copied only if there are some"""
+    if data and any(value is None for value in data.values()):
+        return {key: value for key, value in data.items() if value is not None}
+    return data
+
+
+def _own(handler, cls, item):
+    """Return a copy of a data / meta handler for the item"""
+    copy = cls(item)
+    dict.update(copy, handler.items())
+    return copy
+
+
+def _share(handler, cls, item):
+    """
+        Return the handler to give to the clone of an item (see Graph.clone), the column views are copied
+        --> a handler already shared, or a view not written yet (its source), is given as is
+        --> else the handler becomes shared (it's read through a view by the item too)
+    """
+    if handler is None or handler.shared:
+        return handler
+    if isinstance(handler, HandlerView):
+        if handler.source is not None:
+            return handler.source
+    elif type(handler) is not cls:
+        return _own(handler, cls, item)
+    handler.item = None
+    handler.shared = True
+    return handler
+
+
+def _dotId(value):
+    """Quote a value as a DOT identifier (backslashes are kept, for the graphviz escapes like \\n or \\l)"""
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def _dotAttrs(config):
+    """Format a dict as a DOT attribute list"""
+    if not config:
+        return ''
+    return ' [' + ' '.join(f'{key}={_dotId(val)}' for key, val in config.items()) + ']'
+
+
+@contextlib.contextmanager
+def _openText(file, mode, compress=None, buffering=1 << 16):
+    """Open a path as a (buffered, optionally gzipped) utf-8 text file, file objects are used as they are"""
+    if not isinstance(file, (str, bytes, os.PathLike)):
+        yield file
+        return
+    if compress is None:
+        path = os.fspath(file)
+        compress = path.endswith('.gz' if isinstance(path, str) else b'.gz')
+    if compress:
+        import gzip
+        fp = gzip.open(file, mode + 't', encoding='utf-8')
+    else:
+        fp = open(file, mode, encoding='utf-8', buffering=buffering)
+    with fp:
+        yield fp
 
 
 if __name__ == '__main__':
@@ -0,0 +1,73 @@
+from ..arrays import Array, ArraySet
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+class GraphIndex:
+    """
+        GraphIndex is a hash index of the items (nodes or links) of a graph, by the value of one of their data key,
+        it's made by Graph.createIndex and kept up to date by the graph and the data handlers of its items.
+        PS: missing (None) and unhashable values are not indexed
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.values = {}
+
+    def add(self, item, value):
+        if value is not None and _hashable(value):
+            self.values.setdefault(value, ArraySet()).append(item)
+
+    def discard(self, item, value):
+        if value is not None and _hashable(value):
+            items = self.values.get(value)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del self.values[value]
+
+    def get(self, value):
+        """Return the items indexed with the given value"""
+        return self.values.get(value, ())
+
+    def supports(self, value):
+        """Return True if the index can answer a query on the given value"""
+        return value is not None and _hashable(value)
+
+
+class GraphItemSet(ArraySet):
+    """
+        GraphItemSet is the ArraySet used for Graph.nodes and Graph.links,
+        it knows its graph so $.where can use the indexes of the graph (see Graph.createIndex).
+    """
+    __slots__ = ('graph', 'name')
+
+    def __init__(self, graph, name):
+        super().__init__()
+        self.graph = graph
+        self.name = name
+
+    def where(self, **config):
+        """
+            Return the items whose data match all the (key: val) of config as an Array (see DataConfig.match),
+            if some keys are indexed, only the items of the smallest indexed bucket are checked,
+            else if the data is stored by columns (see Graph.useColumns), the columns are scanned.
+        """
+        indexes = self.graph.indexes[self.name]
+        candidates = self
+        for key, val in config.items():
+            index = indexes.get(key)
+            if index is not None and index.supports(val):
+                bucket = index.get(val)
+                if candidates is self or len(bucket) < len(candidates):
+                    candidates = bucket
+        store = self.graph.columns[self.name]
+        if candidates is self and store is not None:
+            return store.where(**config)
+        return Array(item for item in candidates if item.match(**config))
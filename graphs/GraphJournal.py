@@ -0,0 +1,37 @@
+class GraphJournal:
+    """
+        GraphJournal is the ordered list of the mutations of a graph, made by Graph.useJournal,
+        each change is a tuple (operation, *arguments), the items being identified by their uid :
+        --> ('addNode', uid, data, meta)                          / ('delNode', uid)
+        --> ('addLink', uid, originUid, targetUid, data, meta)    / ('delLink', uid, originUid, targetUid)
+        --> ('setLinkOrigin', uid, originUid)
+        --> ('setNodeId', uid, newUid)
+        --> ('setData', on, uid, key, val)                        / ('delData', on, uid, key)    with on in ('nodes', 'links')
+        --> ('setMeta', on, uid, key, val)                        / ('delMeta', on, uid, key)
+        The version of the graph is the number of changes recorded so far,
+        $.since(version) returns the changes bringing a replica from version to $.version (see Graph.applyChanges).
+        PS: the data & meta changes are captured by the DataHandler hooks ($.data(key, val), $.meta(key, None), ...),
+            the changes made directly through the dict methods ($.data[key] = val, ...) are not recorded
+    """
+
+    def __init__(self, version=0):
+        self.start = version
+        self.changes = []
+
+    @property
+    def version(self):
+        return self.start + len(self.changes)
+
+    def append(self, change):
+        self.changes.append(change)
+
+    def since(self, version):
+        """Return the changes made after version, in O(changes)"""
+        assert self.start <= version <= self.version, f"the changes since version {version} are not in the journal anymore"
+        return self.changes[version - self.start:]
+
+    def truncate(self, version):
+        """Forget the changes made before version (once all the replicas have caught up with it)"""
+        assert self.start <= version <= self.version
+        del self.changes[:version - self.start]
+        self.start = version
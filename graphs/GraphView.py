@@ -0,0 +1,104 @@
+from ..arrays import Array
+
+
+class GraphView:
+    """
+        GraphView is a read-only view of a graph (or of another view), made by Graph.view & Graph.subgraph,
+        nothing is copied : the nodes and links stay the ones of the graph, and the view only selects them.
+        --> a node is in the view if it's in the base, in the selected nodes (if any) and passes nodeFilter (if any)
+        --> a link is in the view if it's in the base, its origin & target are in the view,
+            it's in the selected links (if any) and passes linkFilter (if any)
+        The view follows the changes of the graph (the selection is checked on access),
+        the adjacency of a node in the view is given by $.targetLinks(node), $.origins(node), ...
+        $.clone() makes a graph of the view (see Graph.clone).
+    """
+
+    def __init__(self, base, nodeFilter=None, linkFilter=None, nodes=None, links=None):
+        self.base = base
+        self.graph = base.graph if isinstance(base, GraphView) else base
+        self.nodeFilter = nodeFilter
+        self.linkFilter = linkFilter
+        # selected items ({item: None}, insertion ordered), None to select all the items of the base
+        self.nodeSet = None if nodes is None else dict.fromkeys(nodes)
+        self.linkSet = None if links is None else dict.fromkeys(links)
+
+    def hasNode(self, node):
+        """Return True if the node is in the view"""
+        return (self.base.hasNode(node)
+                and (self.nodeSet is None or node in self.nodeSet)
+                and (self.nodeFilter is None or bool(self.nodeFilter(node))))
+
+    def hasLink(self, link):
+        """Return True if the link is in the view"""
+        return (self.base.hasLink(link)
+                and self.hasNode(link.origin) and self.hasNode(link.target)
+                and (self.linkSet is None or link in self.linkSet)
+                and (self.linkFilter is None or bool(self.linkFilter(link))))
+
+    def getNode(self, uid):
+        """Return the node of the view with the given uid (None if there's no such node)"""
+        node = self.graph.getNode(uid)
+        return node if node is not None and self.hasNode(node) else None
+
+    def getLink(self, uid):
+        """Return the link of the view with the given uid (None if there's no such link)"""
+        link = self.graph.getLink(uid)
+        return link if link is not None and self.hasLink(link) else None
+
+    @property
+    def nodes(self):
+        """Return the nodes of the view, in O(selected nodes) (O(V) when they're selected by nodeFilter only)"""
+        return Array(node for node in (self.base.nodes if self.nodeSet is None else self.nodeSet) if self.hasNode(node))
+
+    @property
+    def links(self):
+        """Return the links of the view, found through the adjacency of the selected nodes if there's no selected links"""
+        if self.linkSet is not None:
+            links = self.linkSet
+        elif self.nodeSet is not None:
+            links = (link for node in self.nodes for link in node._targetLinks)
+        else:
+            links = self.base.links
+        return Array(link for link in links if self.hasLink(link))
+
+    def targetLinks(self, node):
+        """Return the links of the view from the node"""
+        return Array(link for link in node._targetLinks if self.hasLink(link))
+
+    def originLinks(self, node):
+        """Return the links of the view to the node"""
+        return Array(link for link in node._originLinks if self.hasLink(link))
+
+    def targets(self, node):
+        """Return the targets of the node in the view"""
+        return self.targetLinks(node).map(lambda link: link.target)
+
+    def origins(self, node):
+        """Return the origins of the node in the view"""
+        return self.originLinks(node).map(lambda link: link.origin)
+
+    def view(self, nodeFilter=None, linkFilter=None):
+        """Return a view of the view, see Graph.view"""
+        return GraphView(self, nodeFilter, linkFilter)
+
+    def subgraph(self, items, induced=True):
+        """Return a view of the view, see Graph.subgraph"""
+        return self.select(self, items, induced)
+
+    @classmethod
+    def select(cls, base, items, induced=True):
+        """Return the view of base on the given nodes & links, see Graph.subgraph"""
+        Link = (base.graph if isinstance(base, GraphView) else base).Link
+        nodes, links = {}, {}
+        for item in items:
+            if isinstance(item, Link):
+                links[item] = None
+                nodes.setdefault(item.origin)
+                nodes.setdefault(item.target)
+            else:
+                nodes[item] = None
+        return cls(base, nodes=nodes, links=None if induced else links)
+
+    def clone(self):
+        """Return a graph (of the class of the graph) made of the items of the view, see Graph.clone"""
+        return self.graph.clone(self.nodes, self.links)
@@ -0,0 +1,86 @@
+class HandlerView:
+    """
+        HandlerView is the copy-on-write mixin of the data & meta handlers shared by clones (see Graph.clone) :
+        the handler of an item reads through to the shared dict ($.source, never modified) while it's not written,
+        the first write copies the shared dict in the handler itself (then it's a regular handler, $.source is None).
+        It's allocated in O(1) by GraphItem.data / .meta, so the reads never copy.
+        PS: the subclasses define the 'source' slot (see ItemDataView & ItemMetaView)
+        PS: the C functions reading the dict directly (json.dumps, ...) see an empty dict before the first write,
+            give them dict(handler) (or handler.copy())
+    """
+    __slots__ = ()
+
+    def detach(self):
+        """Copy the shared dict in the handler, called before the first write"""
+        if self.source is not None:
+            dict.update(self, self.source)
+            self.source = None
+
+    def get(self, key, default=None):
+        return dict.get(self, key, default) if self.source is None else self.source.get(key, default)
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self, key) if self.source is None else self.source[key]
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) if self.source is None else key in self.source
+
+    def keys(self):
+        return dict.keys(self) if self.source is None else self.source.keys()
+
+    def values(self):
+        return dict.values(self) if self.source is None else self.source.values()
+
+    def items(self):
+        return dict.items(self) if self.source is None else self.source.items()
+
+    def copy(self):
+        return dict(self.items())
+
+    def __iter__(self):
+        return dict.__iter__(self) if self.source is None else iter(self.source)
+
+    def __len__(self):
+        return dict.__len__(self) if self.source is None else len(self.source)
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def toFile(self, filepath):
+        import json
+        with open(filepath, mode='w', encoding='utf-8') as fp:
+            json.dump(self.copy(), fp)
+
+    def __setitem__(self, key, value):
+        self.detach()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.detach()
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        self.detach()
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self.detach()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self.detach()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self.detach()
+        dict.update(self, *args, **kwargs)
+
+    def clear(self):
+        self.source = None
+        dict.clear(self)
@@ -0,0 +1,35 @@
+from ..data import DataHandler
+from .HandlerView import HandlerView
+
+
+class ItemData(DataHandler):
+    """
+        ItemData is the DataHandler of the data of GraphItems,
+        it notifies the graph of the item when its data changes (to keep the graph indexes up to date)
+        PS: the changes made directly through the dict methods ($[key] = val, $.update, ...) are not notified
+        PS: a shared handler (see Graph.clone) has no item, it's read through an ItemDataView by GraphItem.data
+    """
+    __slots__ = ('item', 'shared')
+
+    def __init__(self, item, **kwargs):
+        self.item = None
+        self.shared = False
+        super().__init__(**kwargs)
+        self.item = item
+
+    def onSet(self, key, val):
+        if self.item is not None:
+            self.item.graph.onItemData(self.item, key, self.get(key), val)
+
+    def onDelete(self, key, val):
+        if self.item is not None:
+            self.item.graph.onItemData(self.item, key, val, None)
+
+
+class ItemDataView(HandlerView, ItemData):
+    """ItemDataView is the ItemData of an item reading through to a shared handler until its first write, see HandlerView"""
+    __slots__ = ('source',)
+
+    def __init__(self, item, source):
+        self.source = source
+        super().__init__(item)
@@ -0,0 +1,35 @@
+from ..data import DataHandler
+from .HandlerView import HandlerView
+
+
+class ItemMeta(DataHandler):
+    """
+        ItemMeta is the DataHandler of the meta of GraphItems,
+        it notifies the graph of the item when its meta changes (to record it in the graph journal, see Graph.useJournal)
+        PS: the changes made directly through the dict methods ($[key] = val, $.update, ...) are not notified
+        PS: a shared handler (see Graph.clone) has no item, it's read through an ItemMetaView by GraphItem.meta
+    """
+    __slots__ = ('item', 'shared')
+
+    def __init__(self, item, **kwargs):
+        self.item = None
+        self.shared = False
+        super().__init__(**kwargs)
+        self.item = item
+
+    def onSet(self, key, val):
+        if self.item is not None:
+            self.item.graph.onItemMeta(self.item, key, val)
+
+    def onDelete(self, key, val):
+        if self.item is not None:
+            self.item.graph.onItemMeta(self.item, key, None)
+
+
+class ItemMetaView(HandlerView, ItemMeta):
+    """ItemMetaView is the ItemMeta of an item reading through to a shared handler until its first write, see HandlerView"""
+    __slots__ = ('source',)
+
+    def __init__(self, item, source):
+        self.source = source
+        super().__init__(item)
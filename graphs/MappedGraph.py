@@ -0,0 +1,257 @@
+import json
+import struct
+import sys
+from array import array
+from mmap import mmap as MemoryMap, ACCESS_READ
+
+from ..data.MetaData import DictInterface
+from .FrozenGraph import FrozenGraph
+
+MAGIC = b'DSGRAPH2'
+SECTIONS = (
+    'uids', 'outOffsets', 'outTargets', 'inOffsets', 'inOrigins', 'inLinks', 'linkUids', 'linkOrder',
+    'nodeBlocks', 'linkBlocks', 'blocks', 'stringOffsets', 'strings', 'meta'
+)
+HEADER = struct.Struct('<8s8sQQQ' + 'QQ' * len(SECTIONS))
+
+COUNT = struct.Struct('<I')
+TAG = struct.Struct('<B')
+INT = struct.Struct('<q')
+FLOAT = struct.Struct('<d')
+
+NONE, FALSE, TRUE, INTEGER, REAL, STRING, JSON = range(7)
+
+
+class _Encoder:
+    """Encode the attribute blocks (data + meta) of the items, interning all the strings in a string table"""
+
+    def __init__(self):
+        self.strings = {}
+
+    def string(self, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def value(self, out, value):
+        if value is None:
+            out += TAG.pack(NONE)
+        elif value is True or value is False:
+            out += TAG.pack(TRUE if value else FALSE)
+        elif type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            out += TAG.pack(INTEGER) + INT.pack(value)
+        elif type(value) is float:
+            out += TAG.pack(REAL) + FLOAT.pack(value)
+        elif type(value) is str:
+            out += TAG.pack(STRING) + COUNT.pack(self.string(value))
+        else:
+            out += TAG.pack(JSON) + COUNT.pack(self.string(json.dumps(value)))
+
+    def block(self, *mappings):
+        out = bytearray()
+        for mapping in mappings:
+            mapping = DictInterface.parse(dict(mapping)) if mapping else {}
+            out += COUNT.pack(len(mapping))
+            for key, value in mapping.items():
+                self.value(out, key)
+                self.value(out, value)
+        return out
+
+
+def _align(fp):
+    padding = -fp.tell() % 8
+    if padding:
+        fp.write(bytes(padding))
+
+
+class MappedGraph(FrozenGraph):
+    """
+        MappedGraph is a FrozenGraph read from a binary file (see Graph.save / Graph.load),
+        the file is memory-mapped and its CSR arrays are used in place (zero-copy memoryviews),
+        so loading is O(1) and the pages are read by the OS on demand.
+        The data and meta of the items are decoded lazily, on $.nodeData(i), $.linkData(i), ...
+
+        File layout (native byteorder, checked on load, all sections 8-bytes aligned) :
+        --> header        : magic, byteorder, node count, link count, string count, (offset, size) of each section
+        --> uids          : int64[n]
+        --> CSR arrays    : outOffsets int64[n+1], outTargets int64[m], inOffsets int64[n+1], inOrigins/inLinks int64[m]
+        --> links         : linkUids int64[m] (by link index), linkOrder int64[m] (the link indexes in the order of Graph.links)
+        --> blocks        : the attribute blocks of the nodes then of the links (u32 count + tagged (key, value) pairs)
+        --> nodeBlocks    : int64[n+1] offsets of the node blocks (same for the linkBlocks, int64[m+1])
+        --> string table  : stringOffsets int64[s+1] + utf-8 strings (data keys and string values are stored once)
+        --> meta          : the attribute block of the graph meta
+        PS: non-scalar values (lists, dicts, big ints) are stored as json strings
+    """
+
+    def __init__(self, buffer, graphClass=None):
+        magic, byteorder, nodeCount, linkCount, stringCount, *sections = HEADER.unpack_from(buffer)
+        assert magic == MAGIC, "not a graph file"
+        assert byteorder.rstrip(b'\0').decode() == sys.byteorder, "the graph file was written on a machine with another byteorder"
+
+        self.buffer = buffer
+        self.view = view = memoryview(buffer)
+        self.sections = {}
+        for index, name in enumerate(SECTIONS):
+            offset, size = sections[2 * index], sections[2 * index + 1]
+            self.sections[name] = view[offset:offset + size]
+
+        def ints(name):
+            return self.sections[name].cast('q')
+
+        from .Graph import Graph
+        super().__init__(
+            graphClass or Graph, {}, None, None,
+            ints('outOffsets'), ints('outTargets'), ints('inOffsets'), ints('inOrigins'), ints('inLinks')
+        )
+        self.uids = ints('uids')
+        self.linkUids = ints('linkUids')
+        self.linkOrder = ints('linkOrder')
+        self.nodeBlocks = ints('nodeBlocks')
+        self.linkBlocks = ints('linkBlocks')
+        self.stringOffsets = ints('stringOffsets')
+        self.stringCache = [None] * stringCount
+        assert len(self.uids) == nodeCount and len(self.outTargets) == linkCount
+        self.meta, = self._block(self.sections['meta'], 1)
+
+    @classmethod
+    def open(cls, path, graphClass=None, mmap=True):
+        """Open a graph file, memory-mapped or fully read in memory (mmap=False)"""
+        with open(path, 'rb') as fp:
+            if mmap:
+                buffer = MemoryMap(fp.fileno(), 0, access=ACCESS_READ)
+            else:
+                buffer = fp.read()
+        return cls(buffer, graphClass)
+
+    def close(self):
+        """Release the views and unmap the file, the graph can't be used afterward"""
+        for name in ('outOffsets', 'outTargets', 'inOffsets', 'inOrigins', 'inLinks',
+                     'uids', 'linkUids', 'linkOrder', 'nodeBlocks', 'linkBlocks', 'stringOffsets'):
+            getattr(self, name).release()
+        for view in self.sections.values():
+            view.release()
+        self.view.release()
+        if isinstance(self.buffer, MemoryMap):
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def write(frozen, path):
+        """Write a FrozenGraph in a graph file, the attribute blocks are streamed to the file"""
+        encoder = _Encoder()
+        with open(path, 'wb') as fp:
+            sections = {}
+
+            def section(name, data):
+                _align(fp)
+                offset = fp.tell()
+                fp.write(data)
+                sections[name] = (offset, fp.tell() - offset)
+
+            fp.write(bytes(HEADER.size))
+            section('uids', array('q', map(frozen.nodeUid, range(frozen.nodeCount()))))
+            for name in ('outOffsets', 'outTargets', 'inOffsets', 'inOrigins', 'inLinks'):
+                section(name, array('q', getattr(frozen, name)))
+            links = range(frozen.linkCount())
+            # without the uids of the links (SharedGraph), they're numbered in the order of the links
+            section('linkUids', array('q', links if frozen.linkUids is None else frozen.linkUids))
+            section('linkOrder', array('q', links if frozen.linkOrder is None else frozen.linkOrder))
+
+            _align(fp)
+            start = fp.tell()
+            offsets = {}
+            size = 0
+            for name, count, data, meta in (('nodeBlocks', frozen.nodeCount(), frozen.nodeData, frozen.nodeMeta),
+                                            ('linkBlocks', frozen.linkCount(), frozen.linkData, frozen.linkMeta)):
+                offsets[name] = array('q', [size])
+                for index in range(count):
+                    size += fp.write(encoder.block(data(index), meta(index)))
+                    offsets[name].append(size)
+            sections['blocks'] = (start, size)
+            section('nodeBlocks', offsets['nodeBlocks'])
+            section('linkBlocks', offsets['linkBlocks'])
+
+            meta = encoder.block(frozen.meta)
+            strings = [string.encode('utf-8') for string in encoder.strings]
+            stringOffsets = array('q', [0])
+            for string in strings:
+                stringOffsets.append(stringOffsets[-1] + len(string))
+            section('stringOffsets', stringOffsets)
+            section('strings', b''.join(strings))
+            section('meta', meta)
+
+            fp.seek(0)
+            fp.write(HEADER.pack(
+                MAGIC, sys.byteorder.encode(), frozen.nodeCount(), frozen.linkCount(), len(strings),
+                *(value for name in SECTIONS for value in sections[name])
+            ))
+
+    def string(self, index):
+        string = self.stringCache[index]
+        if string is None:
+            start, end = self.stringOffsets[index], self.stringOffsets[index + 1]
+            string = self.stringCache[index] = str(self.sections['strings'][start:end], 'utf-8')
+        return string
+
+    def _value(self, buffer, offset):
+        tag = buffer[offset]
+        offset += 1
+        if tag == NONE:
+            return None, offset
+        elif tag == FALSE or tag == TRUE:
+            return tag == TRUE, offset
+        elif tag == INTEGER:
+            return INT.unpack_from(buffer, offset)[0], offset + 8
+        elif tag == REAL:
+            return FLOAT.unpack_from(buffer, offset)[0], offset + 8
+        string = self.string(COUNT.unpack_from(buffer, offset)[0])
+        return (string if tag == STRING else json.loads(string)), offset + 4
+
+    def _block(self, buffer, mappings):
+        """Decode the given number of mappings from an attribute block"""
+        result = []
+        offset = 0
+        for _ in range(mappings):
+            count, = COUNT.unpack_from(buffer, offset)
+            offset += 4
+            mapping = {}
+            for _ in range(count):
+                key, offset = self._value(buffer, offset)
+                mapping[key], offset = self._value(buffer, offset)
+            result.append(mapping)
+        return result
+
+    def _item(self, blocks, index):
+        """Decode the (data, meta) of the item at the given index"""
+        return self._block(self.sections['blocks'][blocks[index]:blocks[index + 1]], 2)
+
+    def nodeUid(self, index):
+        return self.uids[index]
+
+    def nodeData(self, index):
+        return self._item(self.nodeBlocks, index)[0]
+
+    def nodeMeta(self, index):
+        return self._item(self.nodeBlocks, index)[1]
+
+    def linkData(self, index):
+        return self._item(self.linkBlocks, index)[0]
+
+    def linkMeta(self, index):
+        return self._item(self.linkBlocks, index)[1]
+
+    def index(self, uid):
+        """Return the index of the node with the given uid"""
+        if self.indexes is None:
+            self.indexes = {uid: index for index, uid in enumerate(self.uids)}
+        return self.indexes[uid]
+
+    def node(self, index):
+        """Return the uid of the node at the given index (the file doesn't keep the original nodes)"""
+        return self.uids[index]
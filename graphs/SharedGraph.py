@@ -0,0 +1,139 @@
+from array import array
+from multiprocessing import shared_memory
+
+from .FrozenGraph import FrozenGraph
+
+ARRAYS = ('uids', 'outOffsets', 'outTargets', 'inOffsets', 'inOrigins', 'inLinks')
+
+
+def _sizes(nodeCount, linkCount, columns):
+    """Return the (name, size) of the sections of a shared block, in order"""
+    sizes = {'uids': nodeCount, 'outOffsets': nodeCount + 1, 'outTargets': linkCount,
+             'inOffsets': nodeCount + 1, 'inOrigins': linkCount, 'inLinks': linkCount}
+    sections = [(name, sizes[name]) for name in ARRAYS]
+    sections.extend(((on, key), nodeCount if on == 'nodes' else linkCount) for on, key, typecode in columns)
+    return sections
+
+
+class SharedGraph(FrozenGraph):
+    """
+        SharedGraph is a FrozenGraph whose arrays (CSR arrays, node uids and some data columns)
+        are stored in a multiprocessing.shared_memory block, so worker processes can use it without copy.
+
+        The parent process makes it with $.share(frozen), pickling it only sends its $.descriptor (a small tuple),
+        so a worker process receiving it attaches to the same block with $.attach(descriptor) (see graphs.parallel).
+        The owner (parent) must $.close() it to free the block, the workers only detach.
+        The shared block doesn't keep the original items : the nodes are identified by their uid ($.index, $.node),
+        the data of the items is made of the shared columns ($.nodeData, $.linkData) and they have no meta.
+        PS: only the columns of ints or floats can be shared (see FrozenGraph.nodeColumn)
+    """
+
+    def __init__(self, memory, descriptor, owner):
+        name, nodeCount, linkCount, columns = descriptor
+        self.memory = memory
+        self.descriptor = descriptor
+        self.owner = owner
+
+        typecodes = {(on, key): typecode for on, key, typecode in columns}
+        view = memoryview(memory.buf)
+        self.views = [view]
+        arrays = {}
+        offset = 0
+        for section, size in _sizes(nodeCount, linkCount, columns):
+            arrays[section] = view[offset:offset + 8 * size].cast(typecodes.get(section, 'q'))
+            self.views.append(arrays[section])
+            offset += 8 * size
+
+        from .Graph import Graph
+        super().__init__(Graph, {}, None, None, arrays['outOffsets'], arrays['outTargets'],
+                         arrays['inOffsets'], arrays['inOrigins'], arrays['inLinks'])
+        self.uids = arrays['uids']
+        self.columns = {(on, key): arrays[on, key] for on, key, _ in columns}
+
+    @classmethod
+    def share(cls, frozen, nodeColumns=(), linkColumns=()):
+        """
+            Copy the arrays of a FrozenGraph (and the given data columns, missing values being 0) in a new shared block,
+            the columns are given as data keys, or as (key, default) pairs.
+        """
+        columns = []
+        values = []
+        for on, keys, column in (('nodes', nodeColumns, frozen.nodeColumn), ('links', linkColumns, frozen.linkColumn)):
+            for key in keys:
+                key, default = key if isinstance(key, tuple) else (key, 0)
+                value = column(key, default)
+                assert isinstance(value, memoryview), f"the column {key!r} of the {on} isn't made of ints or floats"
+                columns.append((on, key, value.format))
+                values.append(value)
+
+        nodeCount, linkCount = frozen.nodeCount(), frozen.linkCount()
+        size = sum(size for _, size in _sizes(nodeCount, linkCount, columns))
+        memory = shared_memory.SharedMemory(create=True, size=max(8 * size, 1))
+        shared = cls(memory, (memory.name, nodeCount, linkCount, tuple(columns)), owner=True)
+
+        shared.uids[:] = array('q', map(frozen.nodeUid, range(nodeCount)))
+        for name in ARRAYS[1:]:
+            getattr(shared, name)[:] = memoryview(getattr(frozen, name))
+        for (on, key, _), value in zip(columns, values):
+            shared.columns[on, key][:] = value
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Attach to the shared block of a SharedGraph made in another process"""
+        return cls(shared_memory.SharedMemory(name=descriptor[0]), descriptor, owner=False)
+
+    def close(self):
+        """Release the views and detach from the block, the owner also frees it"""
+        for view in reversed(self.views):
+            view.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce__(self):
+        return self.attach, (self.descriptor,)
+
+    def nodeUid(self, index):
+        return self.uids[index]
+
+    def _data(self, on, index):
+        return {key: values[index] for (column, key), values in self.columns.items() if column == on}
+
+    def nodeData(self, index):
+        """Return the values of the shared node columns at the given index"""
+        return self._data('nodes', index)
+
+    def nodeMeta(self, index):
+        return {}
+
+    def linkData(self, index):
+        """Return the values of the shared link columns at the given index"""
+        return self._data('links', index)
+
+    def linkMeta(self, index):
+        return {}
+
+    def index(self, node):
+        """Return the index of the node with the given uid (or of the given node of the original graph, by its uid)"""
+        if self.indexes is None:
+            self.indexes = {uid: index for index, uid in enumerate(self.uids)}
+        return self.indexes[getattr(node, 'uid', node)]
+
+    def node(self, index):
+        """Return the uid of the node at the given index (the shared block doesn't keep the original nodes)"""
+        return self.uids[index]
+
+    def nodeColumn(self, key, default=None):
+        """Return the view on a shared column of the nodes"""
+        return self.columns['nodes', key]
+
+    def linkColumn(self, key, default=None):
+        """Return the view on a shared column of the links"""
+        return self.columns['links', key]
@@ -1,20 +1,59 @@
+from array import array
+
 from .DirectedAcyclicGraph import DirectedAcyclicGraph
+from ..arrays import Array
+
+
+def _children(node):
+    return (link.target for link in node._targetLinks)
 
 
 class Node(DirectedAcyclicGraph.Node):
+    __slots__ = ('parent', '_enter', '_exit', '_depth')
+
+    def __init__(self, graph, **data):
+        super().__init__(graph, **data)
+        # parent node, maintained by TreeGraph
+        self.parent = None
+        # preorder interval [_enter, _exit) and depth, computed by TreeGraph.tour
+        self._enter = self._exit = self._depth = None
+
     def addChild(self, node, **config):
         """Shortcut to add a child (target)"""
-        self.graph.setLink(self, node, **config)
+        return self.graph.setLink(self, node, **config)
 
     def setParent(self, node, **config):
         """Shortcut to set the parent (origin)"""
-        self.graph.setLink(node, self, **config)
+        return self.graph.setLink(node, self, **config)
+
+    @property
+    def children(self):
+        """Return the children of the node, in insertion order"""
+        return Array(_children(self))
+
+    @property
+    def depth(self):
+        """Return the depth of the node (0 for the roots), O(1) once the tour is computed"""
+        self.graph.tour()
+        return self._depth
+
+    @property
+    def subtreeSize(self):
+        """Return the number of nodes of the subtree of the node (itself included), O(1) once the tour is computed"""
+        self.graph.tour()
+        return self._exit - self._enter
+
+    def subtree(self):
+        """Return the nodes of the subtree of the node (itself included) in preorder, O(subtree)"""
+        return Array(self.graph.tour()[self._enter:self._exit])
+
+    def isAncestorOf(self, node):
+        """Return True if the node is an ancestor of the given node (or the node itself), O(1)"""
+        return self.graph.isAncestor(self, node)
 
 
 class Link(DirectedAcyclicGraph.Link):
-    def __init__(self, graph, origin, target, **data):
-        assert target.origins.len() < 1, f"{graph.__class__.__name__} Nodes can have a maximum of 1 origin"
-        super().__init__(graph, origin, target, **data)
+    __slots__ = ()
 
 
 class TreeGraph(DirectedAcyclicGraph):
@@ -22,6 +61,121 @@ class TreeGraph(DirectedAcyclicGraph):
         Tree Graph represent a structure where nodes are ordonned by layers.
         Also, each node can have a maximum of 1 origin (called parent in this context)
         Layers can be calculated from the root origin(s) or the root target(s)
+
+        The nodes keep a pointer to their parent, and the tree provides (after an O(n) preorder numbering,
+        see $.tour, recomputed after the structural changes) O(1) ancestry checks, depths and subtree sizes,
+        O(subtree) subtree iteration and O(1) lowest common ancestors (see $.lca).
     """
     Node = Node
     Link = Link
+
+    def __init__(self, **meta):
+        super().__init__(**meta)
+        # preorder of the nodes and sparse table of the lca queries, None when outdated
+        self.preorder = None
+        self.lcaTable = None
+
+    def checkLink(self, origin, target):
+        assert not target._originLinks, f"{self.__class__.__name__} Nodes can have a maximum of 1 origin"
+        super().checkLink(origin, target)
+
+    def checkLinks(self, links):
+        for link in links:
+            assert len(link.target._originLinks) == 1, f"{self.__class__.__name__} Nodes can have a maximum of 1 origin"
+        super().checkLinks(links)
+
+    def _outdate(self):
+        self.preorder = self.lcaTable = None
+
+    def setNode(self, **nodeData):
+        self._outdate()
+        return super().setNode(**nodeData)
+
+    def addNodes(self, records, uids=None):
+        self._outdate()
+        return super().addNodes(records, uids)
+
+    def delNode(self, node):
+        self._outdate()
+        super().delNode(node)
+
+    def setLink(self, origin, target, **linkData):
+        link = super().setLink(origin, target, **linkData)
+        target.parent = origin
+        self._outdate()
+        return link
+
+    def addLinks(self, triples, uids=None):
+        links = super().addLinks(triples, uids)
+        for link in links:
+            link.target.parent = link.origin
+        self._outdate()
+        return links
+
+    def delLink(self, link):
+        super().delLink(link)
+        link.target.parent = None
+        self._outdate()
+
+    def setLinkOrigin(self, link, origin):
+        super().setLinkOrigin(link, origin)
+        link.target.parent = origin
+        self._outdate()
+
+    @property
+    def roots(self):
+        """Return the nodes without parent"""
+        return Array(node for node in self.nodes if node.parent is None)
+
+    def tour(self):
+        """
+            Return the nodes in preorder (the children in insertion order, the roots in the order of $.nodes),
+            and number them : the subtree of a node is the interval preorder[node._enter:node._exit].
+            It's computed in O(n) on the first call after a structural change, then cached.
+        """
+        if self.preorder is None:
+            preorder = Array()
+            for root in self.nodes:
+                if root.parent is not None:
+                    continue
+                stack = [(root, 0)]
+                while stack:
+                    node, depth = stack.pop()
+                    node._enter = len(preorder)
+                    node._depth = depth
+                    preorder.append(node)
+                    stack.extend((child, depth + 1) for child in reversed(list(_children(node))))
+            for node in reversed(preorder):
+                node._exit = max((child._exit for child in _children(node)), default=node._enter + 1)
+            self.preorder = preorder
+        return self.preorder
+
+    def isAncestor(self, ancestor, node):
+        """Return True if ancestor is an ancestor of node (or node itself), O(1)"""
+        self.tour()
+        return ancestor._enter <= node._enter < ancestor._exit
+
+    def lca(self, node1, node2):
+        """
+            Return the lowest common ancestor of two nodes (None if they are in different trees), O(1) per query,
+            with a sparse table of the depths in preorder, built in O(n.log(n)) on the first query after a change :
+            the node of minimal depth in the preorder interval ]enter1, enter2] is a child of the lca.
+        """
+        preorder = self.tour()
+        if node1 is node2:
+            return node1
+        lower, upper = sorted((node1._enter, node2._enter))
+        if self.lcaTable is None:
+            level = array('q', ((node._depth << 32) | index for index, node in enumerate(preorder)))
+            table = [level]
+            step = 1
+            while 2 * step <= len(preorder):
+                level = array('q', map(min, level[:-step], level[step:]))
+                table.append(level)
+                step *= 2
+            self.lcaTable = table
+        lower += 1
+        k = (upper - lower + 1).bit_length() - 1
+        level = self.lcaTable[k]
+        child = preorder[min(level[lower], level[upper - (1 << k) + 1]) & 0xFFFFFFFF]
+        return child.parent
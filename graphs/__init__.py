@@ -1,4 +1,14 @@
-from .Graph import Graph
-from .DirectedAcyclicGraph import DirectedAcyclicGraph
-from .TreeGraph import TreeGraph
-from .ArrayGraph import ArrayGraph
+from ..lazy import lazy
+
+__getattr__, __dir__ = lazy(__name__, {
+    'Graph': '.Graph',
+    'DirectedAcyclicGraph': '.DirectedAcyclicGraph',
+    'TreeGraph': '.TreeGraph',
+    'ArrayGraph': '.ArrayGraph',
+    'FrozenGraph': '.FrozenGraph',
+    'MappedGraph': '.MappedGraph',
+    'SharedGraph': '.SharedGraph',
+    'GraphView': '.GraphView',
+    'ConcurrentGraph': '.ConcurrentGraph',
+    'DagEvaluator': '.DagEvaluator',
+}, submodules=['algorithms', 'parallel'])
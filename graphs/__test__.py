@@ -1,7 +1,26 @@
+import concurrent.futures
+import gc
+import gzip
+import io
+import json
+import os
+import pathlib
+import tempfile
+import threading
 import unittest
 
+from . import algorithms, parallel
+
+from .ArrayGraph import ArrayGraph
+from .ConcurrentGraph import ConcurrentGraph
 from .DirectedAcyclicGraph import DirectedAcyclicGraph
-from .Graph import Graph
+from .Graph import Graph, Link
+from .SharedGraph import SharedGraph
+from .TreeGraph import TreeGraph
+
+
+def _score(shared, index):
+    return shared.degree(index) * shared.nodeColumn('weight')[index]
 
 
 class TestGraph(unittest.TestCase):
@@ -85,6 +104,517 @@ class TestGraph(unittest.TestCase):
         self.assertFalse(graph.hasLink(link))
         self.assertTrue(graph.hasNode(node2))
 
+    def test_0008(self):
+        """Test Node.targets / .origins / .links adjacency indexes"""
+        graph = Graph()
+        node1 = graph.setNode()
+        node2 = graph.setNode()
+        node3 = graph.setNode()
+        l1 = graph.setLink(node1, node2)
+        l2 = graph.setLink(node1, node3)
+        l3 = graph.setLink(node2, node2)
+
+        self.assertEqual(node1.targets, [node2, node3])
+        self.assertEqual(node2.origins, [node1, node2])
+        self.assertEqual(node2.links, [l3, l1])
+        self.assertEqual(graph.links.keep(node2.isVertexOf), [l1, l3])
+        self.assertEqual(node3.targetLinks, [])
+
+        graph.delLink(l2)
+        self.assertEqual(node1.targets, [node2])
+        self.assertEqual(node3.originLinks, [])
+
+        graph.delNode(node2)
+        self.assertEqual(node1.links, [])
+        self.assertEqual(graph.links.len(), 0)
+
+    def test_0009(self):
+        """Test adjacency indexes through Node.copy, Link.copy & Graph.fromDict"""
+        g1 = Graph()
+        n1 = g1.setNode(name='a')
+        n2 = g1.setNode(name='b')
+        link = g1.setLink(n1, n2, type='argument')
+
+        g2 = Graph()
+        c1 = n1.copy(g2)
+        c2 = n2.copy(g2)
+        copy = link.copy(c1, c2)
+        self.assertEqual(c1.targetLinks, [copy])
+        self.assertEqual(c2.origins, [c1])
+        self.assertEqual(n1.targetLinks, [link])
+
+        g3 = Graph.fromDict(g1.toDict())
+        a, b = g3.nodes
+        self.assertEqual(a.targets, [b])
+        self.assertEqual(b.origins, [a])
+        self.assertEqual(b.originLinks.first().data('type'), 'argument')
+
+    def test_0010(self):
+        """Test Node.uid stability & Graph.toDict(compact=True)"""
+        graph = Graph()
+        node1 = graph.setNode()
+        node2 = graph.setNode()
+        node3 = graph.setNode()
+        graph.setLink(node2, node3)
+
+        graph.delNode(node1)
+        self.assertEqual((node2.uid, node3.uid), (1, 2))
+        self.assertIs(graph.getNode(2), node3)
+        self.assertIsNone(graph.getNode(0))
+        self.assertEqual(graph.setNode().uid, 3)
+
+        d = graph.toDict()
+        self.assertEqual([node['#'] for node in d['nodes']], [1, 2, 3])
+        self.assertEqual((d['links'][0]['#origin'], d['links'][0]['#target']), (1, 2))
+
+        d = graph.toDict(compact=True)
+        self.assertEqual([node['#'] for node in d['nodes']], [0, 1, 2])
+        self.assertEqual((d['links'][0]['#origin'], d['links'][0]['#target']), (0, 1))
+
+        copy = Graph.fromDict(graph.toDict())
+        self.assertEqual(copy.nodes.map(lambda node: node.uid), [1, 2, 3])
+        self.assertEqual(copy.getNode(1).targets, [copy.getNode(2)])
+        self.assertEqual(copy.setNode().uid, 4)
+
+    def test_0011(self):
+        """Test Graph.fromRecords with a stream of records"""
+        records = iter([
+            {'meta': {'name': 'streamed'}},
+            {'#': 'x', 'data': {'name': 'x'}},
+            {'#': 'y', 'data': {'name': 'y'}},
+            {'#origin': 'x', '#target': 'y', 'data': {'index': 0}},
+            {'#': 7, 'data': {'name': 'z'}},
+            {'#origin': 'y', '#target': 7},
+        ])
+        graph = Graph.fromRecords(records)
+        x, y, z = graph.nodes
+
+        self.assertEqual(graph.meta('name'), 'streamed')
+        self.assertEqual(x.targets, [y])
+        self.assertEqual(y.targets, [z])
+        self.assertEqual(z.uid, 7)
+        self.assertEqual(x.targetLinks.first().data('index'), 0)
+        self.assertEqual(y.meta(), {})
+
+        # an int id already auto-assigned to a node without int id moves that node to a fresh uid
+        graph = Graph.fromRecords([{'#': 'a', 'data': {'name': 'a'}}, {'#': 0, 'data': {'name': 'b'}},
+                                   {'#origin': 'a', '#target': 0}, {'#origin': 0, '#target': 'a', '#': 0}])
+        a, b = graph.nodes
+        self.assertEqual((a.uid, b.uid), (2, 0))
+        self.assertEqual((a.targets, b.targets), ([b], [a]))
+        self.assertEqual((graph.getNode(2), graph.getLink(0).origin, graph.getLink(2).origin), (a, b, a))
+        self.assertEqual(graph.setNode().uid, 3)
+        self.assertRaises(AssertionError, Graph.fromRecords, [{'#': 0}, {'#': 0}])
+
+    def test_0012(self):
+        """Test Graph.addNodes & Graph.addLinks"""
+        graph = Graph()
+        node0 = graph.setNode()
+        nodes = graph.addNodes({'index': index} for index in range(3))
+        links = graph.addLinks([(node0, nodes[0]), (nodes[0], nodes[1], {'type': 'argument'})])
+
+        self.assertEqual(nodes.map(lambda node: node.uid), [1, 2, 3])
+        self.assertEqual(nodes.map(lambda node: node.data('index')), [0, 1, 2])
+        self.assertIs(graph.getNode(2), nodes[1])
+        self.assertEqual(graph.setNode().uid, 4)
+        self.assertEqual(nodes[0].origins, [node0])
+        self.assertEqual(nodes[0].targets, [nodes[1]])
+        self.assertEqual(links[1].data(), {'type': 'argument'})
+        self.assertEqual(graph.addNodes([{'index': 3, 'name': None}])[0].data(), graph.setNode(index=3, name=None).data())
+        self.assertIsNone(graph.addLinks([(node0, nodes[2], {'type': None})])[0]._data)
+        self.assertTrue(graph.hasLink(links[0]))
+
+        # a failing batch adds none of its links
+        foreign = Graph().setNode()
+        for batch, uids in (([(node0, nodes[1]), (node0, foreign)], None), ([(node0, nodes[1])], [links[0].uid]),
+                            ([(node0, nodes[1]), (node0, nodes[2])], [9, 9])):
+            self.assertRaises(AssertionError, graph.addLinks, batch, uids)
+            self.assertEqual((len(graph.links), len(graph.linksById), node0.targets), (3, 3, [nodes[0], nodes[2]]))
+        graph.delNode(node0)
+        self.assertEqual(len(graph.links), 1)
+
+    def test_0013(self):
+        """Test Graph.freeze & FrozenGraph"""
+        graph = Graph(name='frozen')
+        x, y, a = graph.addNodes([{'name': 'x'}, {'name': 'y'}, {'name': 'add'}])
+        graph.setLink(x, a, index=0)
+        graph.setLink(y, a, index=1)
+        graph.setLink(x, y, weight=.5)
+        graph.delNode(graph.setNode())
+
+        frozen = graph.freeze()
+        self.assertEqual((len(frozen), frozen.linkCount()), (3, 3))
+        self.assertEqual(list(frozen.targets(0)), [2, 1])
+        self.assertEqual(list(frozen.origins(2)), [0, 1])
+        self.assertEqual((frozen.degree(0), frozen.inDegree(1), frozen.inDegree(0)), (2, 1, 0))
+        self.assertIs(frozen.node(frozen.index(y)), y)
+        self.assertIsInstance(frozen.targets(0), memoryview)
+        self.assertEqual(list(frozen.linkColumn('index', -1)), [0, -1, 1])
+        self.assertEqual(frozen.nodeColumn('name'), ['x', 'y', 'add'])
+        self.assertEqual([frozen.links[index] for index in frozen.originLinks(2)], a.originLinks)
+
+        copy = frozen.toGraph()
+        self.assertIsInstance(copy, Graph)
+        self.assertEqual(copy.meta('name'), 'frozen')
+        self.assertEqual(copy.nodes.map(lambda node: node.uid), [0, 1, 2])
+        self.assertEqual(copy.getNode(2).origins.map(lambda node: node.data('name')), ['x', 'y'])
+        self.assertEqual(copy.toDict(), graph.toDict())
+        self.assertEqual(copy.setNode().uid, 3)
+
+        # links made out of the order of the nodes keep their order, uids and the order of the origins of each node
+        graph = Graph()
+        a, b, c = graph.addNodes([{'name': 'a'}, {'name': 'b'}, {'name': 'c'}])
+        graph.setLink(b, c)
+        graph.setLink(a, c)
+        graph.setLink(c, a)
+        graph.setLink(a, b)
+        graph.delLink(graph.links[0])
+        graph.setLink(b, c)
+        graph.setLinkOrigin(graph.links[0], b)
+        copy = graph.freeze().toGraph()
+        self.assertEqual(copy.toDict(), graph.toDict())
+        for node, original in zip(copy.nodes, graph.nodes):
+            self.assertEqual(node.targetLinks.map(lambda link: link.uid), original.targetLinks.map(lambda link: link.uid))
+            self.assertEqual(node.originLinks.map(lambda link: link.uid), original.originLinks.map(lambda link: link.uid))
+        self.assertEqual(copy.setLink(copy.nodes[0], copy.nodes[0]).uid, graph.nextLinkId)
+
+    def test_0014(self):
+        """Test Graph.createIndex & GraphItemSet.where"""
+        graph = Graph()
+        x = graph.setNode(type='variable', name='x')
+        a = graph.setNode(type='operator', name='add')
+        graph.createIndex('type')
+        graph.createIndex('index', on='links')
+        y, m = graph.addNodes([{'type': 'variable', 'name': 'y'}, {'type': 'operator', 'name': 'mul'}])
+        l0 = x.addTarget(a, index=0)
+        l1 = y.addTarget(a, index=1)
+
+        self.assertEqual(graph.nodes.where(type='operator'), [a, m])
+        self.assertEqual(graph.nodes.where(type='variable', name='y'), [y])
+        self.assertEqual(graph.links.where(index=1), [l1])
+        self.assertEqual(graph.nodes.where(name='add'), [a])
+
+        m.data('type', 'variable')
+        x.data(type=None)
+        graph.delNode(y)
+        l0.data('index', 1)
+        self.assertEqual(graph.nodes.where(type='operator'), [a])
+        self.assertEqual(graph.nodes.where(type='variable'), [m])
+        self.assertEqual(graph.links.where(index=1), [l0])
+        self.assertEqual(list(graph.indexes['nodes']['type'].get('variable')), [m])
+
+        graph.dropIndex('type')
+        self.assertEqual(graph.nodes.where(type='variable'), [m])
+
+    def test_0015(self):
+        """Test the compact representation of Node & Link (slots, lazy data & meta)"""
+        for cls in (Graph, DirectedAcyclicGraph, TreeGraph):
+            graph = cls()
+            node1 = graph.setNode()
+            node2 = graph.setNode(name='b')
+            link = graph.setLink(node1, node2)
+
+            self.assertFalse(hasattr(node1, '__dict__'))
+            self.assertFalse(hasattr(link, '__dict__'))
+            self.assertIsNone(node1._data)
+            self.assertIsNone(link._meta)
+            self.assertTrue(node1.match(name=None))
+            self.assertEqual(node1.toDict()['data'], {})
+            self.assertEqual(node2.getData('name'), 'b')
+
+            node1.data('name', 'a')
+            link.meta('note', 'x')
+            self.assertEqual(node1.getData('name'), 'a')
+            self.assertEqual(link.getMeta('note'), 'x')
+
+    def test_0016(self):
+        """Test Graph.useColumns, GraphItemSet.where & ColumnStore aggregations"""
+        graph = Graph()
+        x = graph.setNode(type='variable', name='x', index=0)
+        store = graph.useColumns()
+        y = graph.setNode(type='variable', name='y', index=1)
+        a, m = graph.addNodes([{'type': 'operator', 'name': 'add', 'index': 2}, {'type': 'operator', 'index': 3.5}])
+        link = graph.setLink(x, a, index=0)
+
+        self.assertEqual(x.data(), {'type': 'variable', 'name': 'x', 'index': 0})
+        self.assertEqual(m.data('name'), None)
+        self.assertEqual(graph.nodes.where(type='operator'), [a, m])
+        self.assertEqual(graph.nodes.where(type='variable', index=1), [y])
+        self.assertEqual(graph.nodes.where(name=None), [m])
+        self.assertEqual(store.sum('index', type='variable'), 1)
+        self.assertEqual(store.max('index'), 3.5)
+        self.assertEqual(store.count('name'), 3)
+        self.assertEqual(store.columns['type'].kind, 'str')
+        self.assertEqual(store.columns['index'].kind, 'object')
+
+        y.data(type='operator', name=None)
+        graph.delNode(x)
+        self.assertEqual(graph.nodes.where(type='operator'), [y, a, m])
+        self.assertEqual(y.data(), {'type': 'operator', 'index': 1})
+        self.assertEqual(store.mean('index', type='operator'), 6.5 / 3)
+        self.assertFalse(graph.hasLink(link))
+        self.assertEqual(Graph.fromDict(graph.toDict()).nodes.map(lambda node: node.data()), [y.data(), a.data(), m.data()])
+
+        # the None values are dropped with or without columns
+        results = []
+        for columns in (False, True):
+            graph = Graph()
+            if columns:
+                graph.useColumns()
+            n = graph.setNode(k=None, name='x')
+            o, = graph.addNodes([{'k': None, 'name': 'y'}])
+            n.data('name', None)
+            o.data(k=1)
+            results.append((n.data(), o.data(), [node.uid for node in graph.nodes.where(k=None)],
+                            [node.uid for node in graph.nodes.where(name=None)]))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[1], ({}, {'name': 'y', 'k': 1}, [0], [0]))
+        self.assertEqual(graph.columns['nodes'].columns['k'].kind, 'int')
+        o.data['k'] = None
+        self.assertEqual((o.data(), graph.nodes.where(k=None)), ({'name': 'y'}, [n, o]))
+
+    def test_0017(self):
+        """Test Graph.save & Graph.load (binary graph file, memory-mapped or not)"""
+        graph = Graph(name='expr')
+        x, y, a = graph.addNodes([{'name': 'x', 'value': 1.5}, {'name': 'y', 'shape': [2, 3]}, {'name': 'add', 'big': 2 ** 70}])
+        graph.delNode(x)
+        z = graph.setNode(name='x', flag=True)
+        z.meta('note', 'é')
+        graph.addLinks([(y, a, {'index': 0}), (z, a, {'index': 1}), (z, y)])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'graph.bin')
+            graph.save(path)
+
+            with Graph.load(path) as mapped:
+                self.assertEqual((mapped.nodeCount(), mapped.linkCount()), (3, 3))
+                self.assertEqual(mapped.meta, {'name': 'expr'})
+                self.assertEqual(list(mapped.uids), [1, 2, 3])
+                self.assertEqual(mapped.nodeData(mapped.index(3)), {'name': 'x', 'flag': True})
+                self.assertEqual(mapped.nodeMeta(2), {'note': 'é'})
+                self.assertEqual(list(mapped.targets(2)), [1, 0])
+                self.assertEqual(list(mapped.nodeColumn('big')), [None, 2 ** 70, None])
+                self.assertEqual(list(mapped.linkColumn('index', -1)), [0, 1, -1])
+
+            loaded = Graph.load(path, mmap=False)
+            self.assertEqual(loaded.toDict(), graph.toDict())
+
+            # links made out of the order of the nodes keep their order & uids
+            graph.delLink(graph.links[0])
+            graph.setLink(y, a, index=0)
+            graph.save(path)
+            with Graph.load(path) as mapped:
+                self.assertEqual((list(mapped.linkUids), list(mapped.linkOrder)), ([3, 1, 2], [1, 2, 0]))
+            loaded = Graph.load(path, mmap=False)
+            self.assertEqual(loaded.toDict(), graph.toDict())
+            self.assertEqual(loaded.getNode(2).originLinks.map(lambda link: link.uid), [1, 3])
+
+    def test_0018(self):
+        """Test Graph.iterRecords, Graph.writeJsonl & Graph.readJsonl"""
+        graph = Graph(name='expr')
+        x, y, a = graph.addNodes([{'name': 'x'}, {'name': 'y'}, {'name': 'add'}])
+        graph.addLinks([(x, a, {'index': 0}), (y, a, {'index': 1})])
+        a.meta('note', 'sum')
+
+        records = list(graph.iterRecords())
+        self.assertEqual(records[0], {'meta': {'name': 'expr'}})
+        self.assertEqual(len(records), 6)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('graph.jsonl', 'graph.jsonl.gz'):
+                path = os.path.join(directory, name)
+                self.assertEqual(graph.writeJsonl(path, chunkSize=2), 6)
+                self.assertEqual(Graph.readJsonl(path).toDict(), graph.toDict())
+                path = pathlib.Path(directory, 'path-' + name)
+                self.assertEqual(graph.writeJsonl(path), 6)
+                self.assertEqual(Graph.readJsonl(path).toDict(), graph.toDict())
+            with gzip.open(path, 'rt', encoding='utf-8') as fp:
+                self.assertEqual(json.loads(fp.readline()), records[0])
+
+        buffer = io.StringIO()
+        graph.writeJsonl(buffer, compact=True)
+        buffer.seek(0)
+        self.assertEqual(Graph.readJsonl(buffer).toDict(compact=True), graph.toDict(compact=True))
+
+    def test_0019(self):
+        """Test Graph.writeDot (streamed DOT source, optionally restricted to some nodes)"""
+        graph = Graph()
+        x, y, a = graph.addNodes([{'name': 'x'}, {'name': 'y'}, {'name': 'a "+"'}])
+        graph.addLinks([(x, a, {'index': 0}), (y, a, {'index': 1})])
+        options = dict(node_text=lambda node: node.getData('name'), node_config=lambda node: {},
+                       link_config=lambda link: {'label': link.getData('index')}, node_uid=lambda node: node.uid)
+
+        buffer = io.StringIO()
+        graph.writeDot(buffer, graph_config={'rankdir': 'LR'}, **options)
+        self.assertEqual(buffer.getvalue(), '\n'.join([
+            'digraph {',
+            '\tgraph [rankdir="LR"]',
+            '\t"0" [label="x"]',
+            '\t"1" [label="y"]',
+            '\t"2" [label="a \\"+\\""]',
+            '\t"0" -> "2" [label="0"]',
+            '\t"1" -> "2" [label="1"]',
+            '}\n'
+        ]))
+
+        buffer = io.StringIO()
+        graph.writeDot(buffer, nodes=algorithms.neighborhood(y, hops=1), **options)
+        self.assertNotIn('"0"', buffer.getvalue())
+        self.assertIn('"1" -> "2"', buffer.getvalue())
+
+    def test_0020(self):
+        """Test Graph.useJournal, Graph.changesSince & Graph.applyChanges"""
+        graph = Graph(name='expr')
+        x, y = graph.addNodes([{'name': 'x'}, {'name': 'y'}])
+        graph.setLink(x, y, index=0)
+        journal = graph.useJournal()
+        replica = Graph.fromDict(json.loads(json.dumps(graph.toDict())))
+        version = graph.version
+
+        a = graph.setNode(name='add')
+        l1, l2 = graph.addLinks([(x, a, {'index': 0}), (y, a)])
+        l2.data('index', 1)
+        a.meta('note', 'sum')
+        x.data(name=None, value=2)
+        graph.delNode(y)
+        self.assertEqual(graph.version, 10)
+        self.assertEqual(graph.changesSince(9), [('delNode', 1)])
+
+        replica.applyChanges(json.loads(json.dumps(graph.changesSince(version))))
+        self.assertEqual(replica.toDict(), graph.toDict())
+
+        dag = DirectedAcyclicGraph()
+        dag.useJournal()
+        b, c = dag.addNodes([{}, {}])
+        dag.setLink(b, c)
+        self.assertRaises(AssertionError, dag.addLinks, [(c, b)])
+        self.assertEqual([change[0] for change in dag.changesSince(0)], ['addNode', 'addNode', 'addLink'])
+        dag.setLink(dag.setNode(name='d', value=None), c, index=None)
+        copy = DirectedAcyclicGraph()
+        copy.applyChanges(dag.changesSince(0))
+        self.assertEqual(copy.toDict(), dag.toDict())
+        self.assertEqual((dict(copy.nodes[-1]._data), copy.links[-1]._data), ({'name': 'd'}, None))
+        self.assertRaises(AssertionError, copy.applyChanges, [('addLink', 5, c.uid, b.uid, {}, {})])
+        journal.truncate(9)
+        self.assertRaises(AssertionError, graph.changesSince, 8)
+
+    def test_0021(self):
+        """Test Graph.view & Graph.subgraph read-only views"""
+        graph = Graph()
+        a, b, c, d = graph.addNodes({'name': name, 'weight': weight} for name, weight in zip('abcd', (1, 2, 3, 4)))
+        ab, bc, cd, ac = graph.addLinks([(a, b), (b, c, {'kind': 'strong'}), (c, d), (a, c)])
+
+        sub = graph.subgraph([a, b, c])
+        self.assertEqual((sub.nodes, sub.links), ([a, b, c], [ab, ac, bc]))
+        self.assertEqual((sub.targets(a), sub.origins(c)), ([b, c], [b, a]))
+        self.assertFalse(sub.hasNode(d) or sub.hasLink(cd))
+        self.assertEqual(graph.subgraph([a, bc], induced=False).links, [bc])
+
+        view = graph.view(lambda node: node.getData('weight') > 1, lambda link: link.getData('kind') == 'strong')
+        self.assertEqual((view.nodes, view.links), ([b, c, d], [bc]))
+        self.assertIs(view.getNode(b.uid), b)
+        self.assertIsNone(view.getNode(a.uid))
+        self.assertEqual(view.subgraph([b, c, d]).view(linkFilter=lambda link: False).links, [])
+
+        # the views follow the graph
+        graph.delLink(ac)
+        graph.setLink(b, a)
+        self.assertEqual(sub.links, [ab, bc, graph.links[-1]])
+
+    def test_0022(self):
+        """Test Graph.clone copy-on-write data & Graph.provenance"""
+        graph = DirectedAcyclicGraph(name='base')
+        a, b, c = graph.addNodes([{'name': 'a'}, {'name': 'b'}, {'name': 'c'}])
+        graph.addLinks([(a, b, {'index': 0}), (b, c)])
+        graph.createIndex('name')
+
+        clone = graph.clone()
+        ca, cb, cc = clone.nodes
+        self.assertIsInstance(clone, DirectedAcyclicGraph)
+        self.assertEqual(clone.toDict(), graph.toDict())
+        self.assertIs(ca._data, a._data)
+        self.assertEqual(cb.origins, [ca])
+        self.assertIs(clone.provenance(cb), b)
+
+        ca.data('name', 'x')
+        self.assertIsNot(ca._data, a._data)
+        self.assertEqual((a.getData('name'), ca.getData('name')), ('a', 'x'))
+        self.assertEqual(clone.nodes.where(name='x'), [ca])
+        b.data('name', 'y')
+        self.assertEqual((b.getData('name'), cb.getData('name')), ('y', 'b'))
+        self.assertIsNone(clone.provenance(clone.setNode()))
+
+        # the reads through GraphItem.data don't copy, and a view not written yet is shared as is by the next clone
+        shared = c._data
+        self.assertEqual((c.data('name'), cc.data('name'), cc.data), ('c', 'c', {'name': 'c'}))
+        self.assertIs(cc._data.source, shared)
+        view = c._data
+        self.assertIs(view.source, shared)
+        self.assertIs(graph.clone().nodes[2]._data, shared)
+        self.assertIs(c._data, view)
+        c.data('name', 'z')
+        self.assertEqual((view, cc.data, shared), ({'name': 'z'}, {'name': 'c'}, {'name': 'c'}))
+        self.assertEqual(graph.nodes.where(name='z'), [c])
+
+        partial = graph.subgraph([b, c]).clone()
+        self.assertEqual((partial.nodes.map(lambda node: node.uid), partial.links.len()), ([1, 2], 1))
+        del graph, a, b, c
+        gc.collect()
+        self.assertIsNone(clone.provenance(cb))
+
+    def test_0023(self):
+        """Test ConcurrentGraph snapshot isolation with a writer thread & reader threads"""
+        concurrent = ConcurrentGraph(Graph(name='chain'))
+        with concurrent.write() as graph:
+            graph.setNode(index=0)
+        first = concurrent.snapshot()
+
+        def write():
+            for index in range(1, 50):
+                with concurrent.write() as graph:
+                    last = graph.getNode(index - 1)
+                    last.data('last', None)
+                    graph.setLink(last, graph.setNode(index=index, last=True))
+
+        errors = []
+
+        def read():
+            while concurrent.version < 50:
+                snapshot = concurrent.snapshot()
+                count = snapshot.nodes.len()
+                if snapshot.links.len() != count - 1 or snapshot.nodes.where(last=True).len() > 1:
+                    errors.append(count)
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual((first.nodes.len(), first.meta('name')), (1, 'chain'))
+        self.assertEqual(concurrent.snapshot().nodes.len(), 50)
+        self.assertIsNone(concurrent.snapshot().getNode(0).getData('last'))
+        with self.assertRaises(ZeroDivisionError):
+            with concurrent.write() as graph:
+                graph.setNode()
+                1 / 0
+        self.assertEqual((concurrent.version, concurrent.snapshot().nodes.len()), (50, 50))
+
+    def test_0024(self):
+        """Test Node.lazyTargets, .lazyOrigins, .lazyTargetLinks & .lazyOriginLinks"""
+        graph = Graph()
+        a, b, c = graph.addNodes({'name': name} for name in 'abc')
+        ab, ac, bc = graph.addLinks([(a, b, {'type': 'argument'}), (a, c), (b, c)])
+
+        self.assertEqual(a.lazyTargets.collect(), a.targets)
+        self.assertEqual(c.lazyOrigins.collect(), [a, b])
+        self.assertEqual(a.lazyTargetLinks.keep(lambda link: link.match(type='argument')).map(Link.getTarget).first(), b)
+        self.assertEqual(c.lazyOriginLinks.count(), 2)
+        self.assertEqual(graph.links.lazy().map(Link.getTarget).keep(lambda node: node is c).count(), 2)
+        self.assertFalse(a.lazyOrigins)
+
+
 class TestDirectedAcyclicGraph(unittest.TestCase):
     def test_0001(self):
         """Test DirectedAcyclicGraph.Node.originLayer & .targetLayer"""
@@ -107,4 +637,350 @@ class TestDirectedAcyclicGraph(unittest.TestCase):
         self.assertEqual(node4.originLayer, 2)
         self.assertEqual(node4.targetLayer, 0)
 
+    def test_0002(self):
+        """Test DirectedAcyclicGraph layers update on DirectedAcyclicGraph.setLink & .delLink"""
+        graph = DirectedAcyclicGraph()
+        node1 = graph.setNode()
+        node2 = graph.setNode()
+        node3 = graph.setNode()
+        node4 = graph.setNode()
+
+        graph.setLink(node1, node2)
+        l2 = graph.setLink(node2, node3)
+        graph.setLink(node1, node3)
+        graph.setLink(node3, node4)
+        self.assertEqual([node.originLayer for node in graph.nodes], [0, 1, 2, 3])
+        self.assertEqual([node.targetLayer for node in graph.nodes], [3, 2, 1, 0])
+
+        graph.delLink(l2)
+        self.assertEqual([node.originLayer for node in graph.nodes], [0, 1, 1, 2])
+        self.assertEqual([node.targetLayer for node in graph.nodes], [2, 0, 1, 0])
+
+        graph.delNode(node3)
+        self.assertEqual(node4.originLayer, 0)
+        self.assertEqual(node1.targetLayer, 1)
+
+    def test_0003(self):
+        """Test DirectedAcyclicGraph.layers on a chain of diamonds"""
+        graph = DirectedAcyclicGraph()
+        top = graph.setNode()
+        for _ in range(40):
+            bottom = graph.setNode()
+            top.addTarget(graph.setNode()).target.addTarget(bottom)
+            top.addTarget(graph.setNode()).target.addTarget(bottom)
+            top = bottom
+
+        self.assertEqual(top.originLayer, 80)
+        self.assertEqual(graph.nodes.first().targetLayer, 80)
+
+        layers = graph.layers()
+        self.assertEqual(layers.len(), 81)
+        self.assertEqual(layers[1].len(), 2)
+        self.assertEqual(graph.layers(fromTargets=True)[0], [top])
+
+    def test_0004(self):
+        """Test DirectedAcyclicGraph cycle rejection & .topologicalOrder"""
+        graph = DirectedAcyclicGraph()
+        node1 = graph.setNode()
+        node2 = graph.setNode()
+        node3 = graph.setNode()
+
+        graph.setLink(node3, node2)
+        graph.setLink(node2, node1)
+        self.assertEqual(list(graph.topologicalOrder()), [node3, node2, node1])
+
+        self.assertRaises(AssertionError, graph.setLink, node1, node3)
+        self.assertRaises(AssertionError, graph.setLink, node2, node2)
+        self.assertEqual(graph.links.len(), 2)
+
+        graph.delNode(node2)
+        graph.setLink(node1, node3)
+        self.assertEqual(list(graph.topologicalOrder()), [node1, node3])
+
+    def test_0005(self):
+        """Test DirectedAcyclicGraph.addLinks validation"""
+        graph = DirectedAcyclicGraph()
+        node1, node2, node3 = graph.addNodes([{}, {}, {}])
+        graph.addLinks([(node3, node2), (node2, node1)])
+
+        self.assertEqual(list(graph.topologicalOrder()), [node3, node2, node1])
+        self.assertEqual(node1.originLayer, 2)
+        self.assertEqual(node3.targetLayer, 2)
+
+        self.assertRaises(AssertionError, graph.addLinks, [(node3, node1), (node1, node3)])
+        self.assertEqual(graph.links.len(), 2)
+        self.assertEqual(node3.targets, [node2])
+        self.assertEqual(node1.originLayer, 2)
+        graph.setLink(node3, node1)
+        self.assertRaises(AssertionError, graph.setLink, node1, node3)
+
+    def test_0006(self):
+        """Test DirectedAcyclicGraph.consNode (hash-consing) & .deduplicate"""
+        graph = DirectedAcyclicGraph()
+        graph.useHashConsing()
+        x = graph.consNode(type='variable', name='x')
+        y = graph.consNode(type='variable', name='y')
+        add = graph.consNode((x, {'index': 0}), (y, {'index': 1}), type='operator', name='add')
+        self.assertIs(graph.consNode(type='variable', name='x'), x)
+        self.assertIs(graph.consNode((x, {'index': 0}), (y, {'index': 1}), type='operator', name='add'), add)
+        self.assertIsNot(graph.consNode((y, {'index': 0}), (x, {'index': 1}), type='operator', name='add'), add)
+        self.assertIsNot(graph.consNode(type='variable', name='x', value=1), graph.consNode(type='variable', name='x', value=1.0))
+        self.assertEqual(graph.nodes.len(), 6)
+
+        graph = DirectedAcyclicGraph()
+        x1, y, x2, z = graph.addNodes([{'name': 'x'}, {'name': 'y'}, {'name': 'x'}, {'name': 'z'}])
+        a1, a2, mul = graph.addNodes([{'name': 'add'}, {'name': 'add'}, {'name': 'mul'}])
+        graph.addLinks([(x1, a1, {'index': 0}), (y, a1, {'index': 1}), (x2, a2, {'index': 0}), (y, a2, {'index': 1}),
+                        (a1, mul, {'index': 0}), (a2, mul, {'index': 1}), (x2, z)])
+
+        self.assertEqual(graph.deduplicate(), {x2: x1, a2: a1})
+        self.assertEqual(graph.nodes.len(), 5)
+        self.assertEqual(mul.origins, [a1, a1])
+        self.assertEqual(mul.originLinks.map(lambda link: link.getData('index')), [0, 1])
+        self.assertEqual(x1.targets, [a1, z])
+        self.assertEqual(mul.originLayer, 2)
+        self.assertEqual(graph.deduplicate(), {})
+
+    def test_0007(self):
+        """Test DirectedAcyclicGraph.evaluator (dispatch, caching, incremental & concurrent evaluation)"""
+        graph = DirectedAcyclicGraph()
+        x, y = graph.addNodes([{'type': 'variable', 'value': 2}, {'type': 'variable', 'value': 3}])
+        add = graph.setNode(type='operator', name='add')
+        sub = graph.setNode(type='operator', name='sub')
+        mul = graph.setNode(type='operator', name='mul')
+        graph.addLinks([(y, sub, {'index': 1}), (x, sub, {'index': 0}), (x, add, {'index': 0}), (y, add, {'index': 1}),
+                        (add, mul, {'index': 0}), (sub, mul, {'index': 1})])
+
+        calls = []
+        operations = {
+            'variable': lambda data: calls.append(data['value']) or data['value'],
+            'add': lambda data, a, b: a + b,
+            'sub': lambda data, a, b: a - b,
+            'mul': lambda data, a, b: calls.append('mul') or a * b,
+        }
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            evaluator = graph.evaluator(operations, executor=executor)
+            self.assertEqual(evaluator.evaluate(mul), -5)
+            self.assertEqual(evaluator.evaluate(sub, add), [-1, 5])
+            self.assertEqual(sorted(calls, key=str), [2, 3, 'mul'])
+
+            calls.clear()
+            y.data('value', 4)
+            self.assertEqual(evaluator.evaluate(mul), -12)
+            self.assertEqual(calls, [4, 'mul'])
+
+        graph.delLink(sub.originLinks.first())
+        graph.setLink(x, sub, index=1)
+        self.assertEqual(evaluator.evaluate(mul), 0)
+        self.assertEqual(graph.journal.changes, [])
+
+        # an evaluator lagging behind the truncated journal drops its cached values
+        evaluator.executor = None
+        other = graph.evaluator(operations)
+        self.assertFalse(other.ownsJournal)
+        self.assertEqual(other.evaluate(add), 6)
+        x.data('value', 1)
+        self.assertEqual(evaluator.evaluate(add), 5)
+        calls.clear()
+        self.assertEqual(other.evaluate(add), 5)
+        self.assertEqual(sorted(calls), [1, 4])
+        self.assertRaises(KeyError, evaluator.evaluate, graph.setNode(type='constant'))
+
+        single = DirectedAcyclicGraph()
+        single.setNode(type='variable', value=7)
+        self.assertEqual(single.evaluator(operations).evaluate(), [7])
+
+
+class TestTreeGraph(unittest.TestCase):
+    def test_0001(self):
+        """Test TreeGraph single parent constraint, with TreeGraph.setLink & TreeGraph.addLinks"""
+        graph = TreeGraph()
+        root, child1, child2 = graph.addNodes([{}, {}, {}])
+        graph.addLinks([(root, child1), (root, child2)])
+
+        self.assertRaises(AssertionError, graph.setLink, child1, child2)
+        self.assertRaises(AssertionError, graph.addLinks, [(child2, child1)])
+        self.assertRaises(AssertionError, graph.addLinks, [(child1, child2), (child1, child2)])
+        self.assertEqual(graph.links.len(), 2)
+        self.assertEqual(child2.origins, [root])
+
+    def test_0002(self):
+        """Test TreeGraph parent pointers, TreeGraph.tour, .isAncestor & .lca, Node.depth, .subtree & .subtreeSize"""
+        graph = TreeGraph()
+        a, b, c, d, e, f, g = graph.addNodes({'name': name} for name in 'abcdefg')
+        graph.addLinks([(a, b), (a, c), (b, d), (b, e)])
+        c.addChild(f)
+
+        self.assertIs(f.parent, c)
+        self.assertIsNone(a.parent)
+        self.assertEqual(b.children, [d, e])
+        self.assertEqual(graph.roots, [a, g])
+        self.assertEqual(graph.tour(), [a, b, d, e, c, f, g])
+        self.assertEqual(b.subtree(), [b, d, e])
+        self.assertEqual((a.subtreeSize, b.subtreeSize, f.subtreeSize), (6, 3, 1))
+        self.assertEqual((a.depth, e.depth, f.depth, g.depth), (0, 2, 2, 0))
+        self.assertTrue(a.isAncestorOf(e) and b.isAncestorOf(b))
+        self.assertFalse(b.isAncestorOf(f) or e.isAncestorOf(b))
+
+        self.assertIs(graph.lca(d, e), b)
+        self.assertIs(graph.lca(e, f), a)
+        self.assertIs(graph.lca(b, e), b)
+        self.assertIs(graph.lca(f, f), f)
+        self.assertIsNone(graph.lca(d, g))
+
+        # the numbering follows the structural changes
+        graph.delLink(next(iter(c._targetLinks)))
+        self.assertIsNone(f.parent)
+        g.addChild(f)
+        graph.setLinkOrigin(next(iter(e._originLinks)), c)
+        self.assertIs(e.parent, c)
+        self.assertEqual(graph.tour(), [a, b, d, c, e, g, f])
+        self.assertIs(graph.lca(d, e), a)
+        self.assertIs(graph.lca(f, g), g)
+        self.assertEqual(c.subtreeSize, 2)
+
+    def test_0003(self):
+        """Test TreeGraph.lca against a walk up the parents, on a wide and a deep tree"""
+        def walk(node1, node2):
+            ancestors = set()
+            while node1 is not None:
+                ancestors.add(node1)
+                node1 = node1.parent
+            while node2 is not None and node2 not in ancestors:
+                node2 = node2.parent
+            return node2
+
+        graph = TreeGraph()
+        root, *kids = graph.addNodes({} for _ in range(41))
+        graph.addLinks((root, kid) for kid in kids)
+        self.assertIs(graph.lca(kids[0], kids[-1]), root)
+
+        graph = TreeGraph()
+        nodes = graph.addNodes({} for _ in range(100))
+        # a deep tree : each node is linked under one of the 3 previous nodes
+        graph.addLinks((nodes[index - 1 - index % 3 if index > 2 else 0], nodes[index]) for index in range(1, 100))
+        for node1 in nodes[::7]:
+            for node2 in nodes[::5]:
+                self.assertIs(graph.lca(node1, node2), walk(node1, node2))
+
+
+class TestArrayGraph(unittest.TestCase):
+    def test_0001(self):
+        """Test ArrayGraph single predecessor & successor constraints"""
+        graph = ArrayGraph()
+        a, b, c = graph.addNodes([{}, {}, {}])
+        graph.addLinks([(a, b), (b, c)])
+
+        self.assertRaises(AssertionError, graph.setLink, a, c)
+        self.assertRaises(AssertionError, graph.addLinks, [(c, a)])
+        self.assertRaises(AssertionError, graph.setLinkOrigin, next(iter(c._originLinks)), a)
+        self.assertEqual((b.prev, b.next, c.next), (a, c, None))
+
+        # merging two nodes with a target would give two targets to a node
+        x, y = graph.addNodes([{'name': 'x'}, {'name': 'x'}])
+        graph.addLinks([(x, graph.setNode(name='a')), (y, graph.setNode(name='b'))])
+        self.assertRaises(AssertionError, graph.deduplicate)
+        self.assertEqual((x.targets.len(), y.targets.len()), (1, 1))
+
+    def test_0002(self):
+        """Test ArrayGraph.append, .insert, .splice, .pop, .at & .toArray, Node.index"""
+        graph = ArrayGraph()
+        a, b, c = (graph.append(name=name) for name in 'abc')
+        self.assertEqual(graph.toArray(), [a, b, c])
+        self.assertIs(graph.toArray(), graph.toArray())
+
+        x = graph.insert(1, name='x')
+        y, z = graph.splice(0, [{'name': 'y'}, {'name': 'z'}])
+        w = graph.insert(-1, name='w')
+        self.assertEqual(graph.toArray(), [y, z, a, x, b, w, c])
+        self.assertEqual((graph.at(3), x.index, c.index), (x, 3, 6))
+        self.assertEqual((x.prev, x.next, y.prev), (a, b, None))
+        self.assertEqual(graph.links.len(), 6)
+
+        self.assertIs(graph.pop(), c)
+        self.assertIs(graph.pop(2), a)
+        self.assertEqual(graph.toArray(), [y, z, x, b, w])
+        self.assertEqual((z.next, b.index), (x, 3))
+        self.assertEqual(graph.tour(), graph.toArray())
+
+        # after a generic change the order index is rebuilt from the links
+        graph.delLink(next(iter(x._originLinks)))
+        self.assertEqual(graph.toArray(), [x, b, w, y, z])
+        self.assertIsNone(x.prev)
+
+
+class TestAlgorithms(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+        self.a, self.b, self.c, self.d, self.e = self.graph.addNodes({'name': name} for name in 'abcde')
+        self.graph.addLinks([
+            (self.a, self.b, {'weight': 4}),
+            (self.a, self.c, {'weight': 1}),
+            (self.c, self.b, {'weight': 1}),
+            (self.b, self.d, {'weight': 5}),
+            (self.d, self.c),
+        ])
+
+    def test_0001(self):
+        """Test algorithms.bfs, .dfs, .reachable & .neighborhood"""
+        a, b, c, d, e = self.graph.nodes
+        self.assertEqual(list(algorithms.bfs(a)), [a, b, c, d])
+        self.assertEqual(list(algorithms.dfs(a)), [a, b, d, c])
+        self.assertEqual(list(algorithms.bfs(d, reverse=True)), [d, b, a, c])
+        self.assertEqual(algorithms.reachable([e, c]), {e, c, b, d})
+        self.assertEqual(algorithms.neighborhood(a, hops=1), {a, b, c})
+        self.assertEqual(algorithms.neighborhood(a, hops=2), {a, b, c, d})
+        self.assertEqual(algorithms.neighborhood(d, reverse=False), {d, c})
+
+        bfs = algorithms.bfs(a)
+        self.assertIs(next(bfs), a)
+        bfs.close()
+
+    def test_0002(self):
+        """Test algorithms.topologicalSort, .connectedComponents & .stronglyConnectedComponents"""
+        a, b, c, d, e = self.graph.nodes
+        self.assertRaises(Exception, list, algorithms.topologicalSort(self.graph))
+        self.assertEqual(list(map(set, algorithms.connectedComponents(self.graph))), [{a, b, c, d}, {e}])
+        self.assertEqual(list(map(set, algorithms.stronglyConnectedComponents(self.graph))), [{b, c, d}, {a}, {e}])
+
+        self.graph.delLink(d.targetLinks.first())
+        self.assertEqual(list(algorithms.topologicalSort(self.graph)), [a, e, c, b, d])
+
+        dag = DirectedAcyclicGraph()
+        x, y = dag.addNodes([{}, {}])
+        dag.setLink(y, x)
+        self.assertEqual(list(algorithms.topologicalSort(dag)), [y, x])
+
+    def test_0003(self):
+        """Test algorithms.dijkstra, .shortestPath & .astar"""
+        a, b, c, d, e = self.graph.nodes
+        self.assertEqual(list(algorithms.dijkstra(a)), [(a, 0), (c, 1), (b, 2), (d, 7)])
+        self.assertEqual(algorithms.shortestPath(a, d), [a, c, b, d])
+        self.assertEqual(algorithms.shortestPath(a, d, weight=lambda link: 1), [a, b, d])
+        self.assertIsNone(algorithms.shortestPath(a, e))
+        self.assertEqual(algorithms.astar(a, d, heuristic=lambda node: 0), [a, c, b, d])
+        self.assertEqual(algorithms.shortestPath(d, a, reverse=True), [d, b, c, a])
+
+    def test_0004(self):
+        """Test parallel.pagerank, .multiSourceBfs & .mapNodes"""
+        a, b, c, d, e = self.graph.nodes
+        ranks = parallel.pagerank(self.graph, processes=2)
+        self.assertAlmostEqual(sum(ranks), 1)
+        self.assertEqual(max(range(5), key=ranks.__getitem__), 1)
+        self.assertAlmostEqual(ranks[0], ranks[4])
+
+        distances = parallel.multiSourceBfs(self.graph, [a, d], processes=2, batchSize=1)
+        self.assertEqual([list(row) for row in distances], [[0, 1, 1, 2, -1], [-1, 2, 1, 0, -1]])
+        self.assertEqual(list(parallel.multiSourceBfs(self.graph, [3], reverse=True, processes=2)[0]), [2, 1, 2, 0, -1])
 
+        frozen = self.graph.freeze()
+        with SharedGraph.share(frozen, nodeColumns=[('weight', 2)]) as shared:
+            self.assertEqual(parallel.mapNodes(shared, _score, processes=2), [4, 2, 2, 2, 0])
+            self.assertEqual(parallel.mapNodes(shared, _score, reduce=max, processes=2, chunks=3), 4)
+            self.assertEqual(parallel.mapNodes(shared, _score, reduce=lambda x, y: x + y, processes=2, chunks=3), 10)
+            self.assertEqual(list(parallel.multiSourceBfs(shared, [d], processes=2)[0]), [-1, 2, 1, 0, -1])
+            self.assertEqual((shared.index(d.uid), shared.node(3), shared.nodeData(0), shared.linkData(0)),
+                             (3, d.uid, {'weight': frozen.nodeColumn('weight', 2)[0]}, {}))
+            copy = shared.toGraph()
+            self.assertEqual(copy.nodes.map(lambda node: (node.uid, node.targets.len())),
+                             self.graph.nodes.map(lambda node: (node.uid, node.targets.len())))
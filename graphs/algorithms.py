@@ -0,0 +1,245 @@
+"""
+    Traversal and path algorithms over Graph (and its subclasses),
+    they all run in O(V+E) (O((V+E).log(V)) for the weighted paths) using the adjacency indexes of the nodes,
+    and most of them are generators, so they stop as soon as the consumer stops iterating.
+
+    The traversals can follow the links from origin to target (default) or backward with reverse=True.
+    ``sources`` can be a single Node or an iterable of Nodes.
+"""
+import heapq
+import itertools
+from collections import deque
+
+from ..arrays import Array
+from .Graph import Node, Link
+
+
+def _targets(node):
+    return (link.target for link in node._targetLinks)
+
+
+def _origins(node):
+    return (link.origin for link in node._originLinks)
+
+
+def _neighbors(node):
+    return itertools.chain(_targets(node), _origins(node))
+
+
+def _sources(sources):
+    return [sources] if isinstance(sources, Node) else list(sources)
+
+
+def _weight(weight):
+    """Return a function link -> weight, from a callable or from a data key (missing values count as 1)"""
+    if callable(weight):
+        return weight
+    return lambda link: link.getData(weight, 1)
+
+
+def bfs(sources, reverse=False):
+    """Yield the nodes reachable from the sources, in breadth-first order"""
+    children = _origins if reverse else _targets
+    queue = deque(_sources(sources))
+    seen = set(queue)
+    while queue:
+        node = queue.popleft()
+        yield node
+        for child in children(node):
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+
+
+def dfs(sources, reverse=False):
+    """Yield the nodes reachable from the sources, in depth-first preorder"""
+    children = _origins if reverse else _targets
+    stack = _sources(sources)[::-1]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        yield node
+        stack.extend(child for child in reversed(list(children(node))) if child not in seen)
+
+
+def reachable(sources, reverse=False):
+    """Return the set of the nodes reachable from the sources (sources included)"""
+    return set(bfs(sources, reverse=reverse))
+
+
+def neighborhood(sources, hops=1, reverse=None):
+    """
+        Return the set of the nodes at most ``hops`` links away from the sources (sources included),
+        the links are followed in both directions by default, reverse=False (True) only follows them forward (backward).
+    """
+    children = _neighbors if reverse is None else _origins if reverse else _targets
+    seen = set(_sources(sources))
+    layer = list(seen)
+    for _ in range(hops):
+        nextLayer = []
+        for node in layer:
+            for child in children(node):
+                if child not in seen:
+                    seen.add(child)
+                    nextLayer.append(child)
+        layer = nextLayer
+    return seen
+
+
+def topologicalSort(graph):
+    """
+        Yield the nodes of the graph in topological order (origins before targets),
+        for a DirectedAcyclicGraph the maintained order is used, for other graphs Kahn's algorithm,
+        which raises an Exception if the graph has a cycle.
+    """
+    if hasattr(graph, 'topologicalOrder'):
+        yield from graph.topologicalOrder()
+        return
+
+    degrees = {node: len(node._originLinks) for node in graph.nodes}
+    queue = deque(node for node, degree in degrees.items() if not degree)
+    count = 0
+    while queue:
+        node = queue.popleft()
+        count += 1
+        yield node
+        for child in _targets(node):
+            degrees[child] -= 1
+            if not degrees[child]:
+                queue.append(child)
+    if count < len(degrees):
+        raise Exception(f"{graph.__class__.__name__} has a cycle, it can't be sorted topologically")
+
+
+def connectedComponents(graph):
+    """Yield the (weakly) connected components of the graph, as Arrays of nodes"""
+    seen = set()
+    for root in graph.nodes:
+        if root in seen:
+            continue
+        seen.add(root)
+        component = Array()
+        component.append(root)
+        stack = [root]
+        while stack:
+            for neighbor in _neighbors(stack.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    component.append(neighbor)
+                    stack.append(neighbor)
+        yield component
+
+
+def stronglyConnectedComponents(graph):
+    """Yield the strongly connected components of the graph, as Arrays of nodes (iterative Tarjan's algorithm)"""
+    indexes = {}
+    lowlinks = {}
+    stack = []
+    onStack = set()
+    counter = itertools.count()
+
+    for root in graph.nodes:
+        if root in indexes:
+            continue
+        indexes[root] = lowlinks[root] = next(counter)
+        stack.append(root)
+        onStack.add(root)
+        work = [(root, _targets(root))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in indexes:
+                    indexes[child] = lowlinks[child] = next(counter)
+                    stack.append(child)
+                    onStack.add(child)
+                    work.append((child, _targets(child)))
+                    break
+                elif child in onStack:
+                    lowlinks[node] = min(lowlinks[node], indexes[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                if lowlinks[node] == indexes[node]:
+                    component = Array()
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(member)
+                        component.append(member)
+                        if member is node:
+                            break
+                    yield component
+
+
+def dijkstra(sources, weight='weight', reverse=False):
+    """
+        Yield (node, distance) pairs by increasing distance from the sources (Dijkstra's algorithm),
+        ``weight`` is a data key of the links (missing values count as 1) or a function link -> weight,
+        weights can't be negative.
+    """
+    for node, distance, _ in _dijkstra(sources, _weight(weight), reverse):
+        yield node, distance
+
+
+def _dijkstra(sources, weight, reverse, heuristic=None):
+    """Yield (node, distance, predecessors) by increasing (estimated) distance, A* if a heuristic is given"""
+    links = (lambda node: node._originLinks) if reverse else (lambda node: node._targetLinks)
+    other = Link.getOrigin if reverse else Link.getTarget
+    distances = {}
+    predecessors = {}
+    done = set()
+    counter = itertools.count()
+    heap = []
+    for source in _sources(sources):
+        distances[source] = 0
+        predecessors[source] = None
+        heapq.heappush(heap, (heuristic(source) if heuristic else 0, next(counter), source))
+
+    while heap:
+        _, _, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        done.add(node)
+        yield node, distances[node], predecessors
+        for link in links(node):
+            cost = weight(link)
+            assert cost >= 0, "dijkstra can't handle negative weights"
+            child = other(link)
+            distance = distances[node] + cost
+            if child not in done and distance < distances.get(child, distance + 1):
+                distances[child] = distance
+                predecessors[child] = node
+                estimate = distance + heuristic(child) if heuristic else distance
+                heapq.heappush(heap, (estimate, next(counter), child))
+
+
+def _path(predecessors, target):
+    path = Array()
+    while target is not None:
+        path.append(target)
+        target = predecessors[target]
+    path.reverse()
+    return path
+
+
+def shortestPath(source, target, weight='weight', reverse=False):
+    """Return the shortest path (Array of nodes) from source to target, None if target is unreachable"""
+    for node, _, predecessors in _dijkstra(source, _weight(weight), reverse):
+        if node is target:
+            return _path(predecessors, target)
+    return None
+
+
+def astar(source, target, heuristic, weight='weight', reverse=False):
+    """
+        Return the shortest path (Array of nodes) from source to target with the A* algorithm, None if target is unreachable,
+        ``heuristic`` is a function node -> estimated distance to target, it should be consistent (never overestimating).
+    """
+    for node, _, predecessors in _dijkstra(source, _weight(weight), reverse, heuristic):
+        if node is target:
+            return _path(predecessors, target)
+    return None
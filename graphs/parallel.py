@@ -0,0 +1,197 @@
+"""
+    Parallel analytics over the array-backed view of a graph (see SharedGraph) :
+    the arrays are put once in shared memory, then a pool of worker processes attaches to them (zero-copy)
+    and runs the work by chunks of nodes (or batches of sources), so the passes aren't bound by the GIL.
+
+    The functions accept a Graph, a FrozenGraph or a SharedGraph, and use the indexes of the nodes in the snapshot
+    (see FrozenGraph.index), the results are indexed the same way.
+    ``processes`` is the size of the pool (os.cpu_count() by default), ``chunks`` the number of tasks (4 per process).
+"""
+import functools
+import os
+import pickle
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .FrozenGraph import FrozenGraph
+from .SharedGraph import SharedGraph
+
+_graph = None
+_buffers = {}
+
+
+def _init(graph):
+    global _graph
+    _graph = graph
+
+
+def _buffer(name):
+    """Return the views (contributions, ranks) on a shared buffer of the PageRank, attached once per worker"""
+    if name not in _buffers:
+        memory = shared_memory.SharedMemory(name=name)
+        ranks = memoryview(memory.buf).cast('d')
+        _buffers[name] = (memory, ranks[:len(ranks) // 2], ranks[len(ranks) // 2:])
+    return _buffers[name][1:]
+
+
+def _processes(processes):
+    return processes or os.cpu_count() or 1
+
+
+def _chunks(count, chunks):
+    size = -(-count // chunks) if count else 1
+    return [range(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+class _Shared:
+    """Context manager giving the SharedGraph of a graph, shared (then freed) only if it's not already a SharedGraph"""
+
+    def __init__(self, graph, **columns):
+        if isinstance(graph, SharedGraph):
+            self.frozen = self.graph = graph
+            self.owned = False
+        else:
+            self.frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+            self.graph = SharedGraph.share(self.frozen, **columns)
+            self.owned = True
+
+    def index(self, node):
+        return node if isinstance(node, int) else self.frozen.index(node)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.owned:
+            self.graph.close()
+
+
+def _pool(shared, processes):
+    return ProcessPoolExecutor(_processes(processes), initializer=_init, initargs=(shared,))
+
+
+def _pagerankContributions(name, nodes):
+    """Compute rank / out-degree of the nodes, return the rank of the dangling ones"""
+    contributions, ranks = _buffer(name)
+    offsets = _graph.outOffsets
+    dangling = 0.0
+    for node in nodes:
+        degree = offsets[node + 1] - offsets[node]
+        if degree:
+            contributions[node] = ranks[node] / degree
+        else:
+            contributions[node] = 0.0
+            dangling += ranks[node]
+    return dangling
+
+
+def _pagerankRanks(name, nodes, base, damping):
+    """Update the ranks of the nodes from the contributions of their origins, return the L1 change"""
+    contributions, ranks = _buffer(name)
+    offsets, origins = _graph.inOffsets, _graph.inOrigins
+    delta = 0.0
+    for node in nodes:
+        rank = base + damping * sum(contributions[origin] for origin in origins[offsets[node]:offsets[node + 1]])
+        delta += abs(rank - ranks[node])
+        ranks[node] = rank
+    return delta
+
+
+def pagerank(graph, damping=0.85, tolerance=1e-9, maxIterations=100, processes=None, chunks=None):
+    """
+        Return the PageRank of the nodes as an array('d'), computed by power iterations in parallel,
+        each iteration runs two passes over chunks of nodes (contributions, then ranks pulled from the in-links),
+        it stops when the L1 change of the ranks is under tolerance.
+    """
+    with _Shared(graph) as shared:
+        count = shared.graph.nodeCount()
+        if not count:
+            return array('d')
+        memory = shared_memory.SharedMemory(create=True, size=16 * count)
+        ranks = memoryview(memory.buf).cast('d')
+        try:
+            ranks[count:] = array('d', [1 / count]) * count
+            ranges = _chunks(count, chunks or 4 * _processes(processes))
+            with _pool(shared.graph, processes) as pool:
+                for _ in range(maxIterations):
+                    dangling = sum(pool.map(_pagerankContributions, [memory.name] * len(ranges), ranges))
+                    base = (1 - damping) / count + damping * dangling / count
+                    delta = sum(pool.map(functools.partial(_pagerankRanks, memory.name, base=base, damping=damping), ranges))
+                    if delta < tolerance:
+                        break
+            result = array('d', ranks[count:])
+        finally:
+            ranks.release()
+            memory.close()
+            memory.unlink()
+    return result
+
+
+def _bfs(sources, reverse):
+    """Return the distances (array('q'), -1 if unreachable) from each source"""
+    if reverse:
+        offsets, neighbors = _graph.inOffsets, _graph.inOrigins
+    else:
+        offsets, neighbors = _graph.outOffsets, _graph.outTargets
+    count = _graph.nodeCount()
+    result = []
+    for source in sources:
+        distances = array('q', [-1]) * count
+        distances[source] = 0
+        layer = [source]
+        distance = 0
+        while layer:
+            distance += 1
+            nextLayer = []
+            for node in layer:
+                for child in neighbors[offsets[node]:offsets[node + 1]]:
+                    if distances[child] < 0:
+                        distances[child] = distance
+                        nextLayer.append(child)
+            layer = nextLayer
+        result.append(distances)
+    return result
+
+
+def multiSourceBfs(graph, sources, reverse=False, processes=None, batchSize=16):
+    """
+        Run a breadth-first search from each source (node or node index) in parallel, by batches of sources,
+        return the list (ordered like sources) of the distances from each source, as array('q') (-1 if unreachable).
+    """
+    with _Shared(graph) as shared:
+        sources = [shared.index(source) for source in sources]
+        batches = [sources[start:start + batchSize] for start in range(0, len(sources), batchSize)]
+        with _pool(shared.graph, processes) as pool:
+            return [distances for batch in pool.map(_bfs, batches, [reverse] * len(batches)) for distances in batch]
+
+
+def _picklable(value):
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _map(func, reduce, nodes):
+    values = [func(_graph, node) for node in nodes]
+    if reduce is not None and values:
+        return [functools.reduce(reduce, values)]
+    return values
+
+
+def mapNodes(graph, func, reduce=None, nodeColumns=(), processes=None, chunks=None):
+    """
+        Run func(shared, index) for all the node indexes in parallel, func must be picklable (a module level function),
+        shared is the SharedGraph (use its arrays, and its nodeColumns, given as in SharedGraph.share).
+        Return the list of the results (indexed like the nodes), or their reduction with reduce(a, b) if given :
+        the chunks are reduced by the workers if reduce is picklable, else all the results are reduced by the parent
+        (so reduce can be a lambda).
+    """
+    with _Shared(graph, nodeColumns=nodeColumns) as shared:
+        ranges = _chunks(shared.graph.nodeCount(), chunks or 4 * _processes(processes))
+        task = functools.partial(_map, func, reduce if _picklable(reduce) else None)
+        with _pool(shared.graph, processes) as pool:
+            values = [value for values in pool.map(task, ranges) for value in values]
+    return values if reduce is None else functools.reduce(reduce, values)
@@ -0,0 +1,49 @@
+"""
+    Lazy loading of the names exported by the packages (PEP 562),
+    a package declares its exports in its __init__ and they are imported on first access :
+
+    >>> __getattr__, __dir__ = lazy(__name__, {'Graph': '.Graph'}, submodules=['algorithms'])
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+        LazyModule is the module type of the lazy packages,
+        the import system sets every imported submodule as an attribute of its package,
+        for a submodule named like the class it exports (Graph.Graph, ...), the package keeps the class instead.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and self.__exports__.get(name) == '.' + name:
+            value = getattr(value, name, value)
+        super().__setattr__(name, value)
+
+
+def lazy(name, exports, submodules=()):
+    """
+        Make the package ``name`` lazy and return its (__getattr__, __dir__) functions,
+        exports is a {attribute: module} mapping (module path relative to the package) of the exported names,
+        submodules are the names of the submodules exported as they are.
+    """
+    module = sys.modules[name]
+
+    def __getattr__(attribute):
+        if attribute in exports:
+            value = getattr(importlib.import_module(exports[attribute], name), attribute)
+        elif attribute in submodules:
+            value = importlib.import_module('.' + attribute, name)
+        else:
+            raise AttributeError(f"module {name!r} has no attribute {attribute!r}")
+        setattr(module, attribute, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(exports) | set(submodules))
+
+    module.__exports__ = exports
+    module.__all__ = [*exports, *submodules]
+    module.__class__ = LazyModule
+    return __getattr__, __dir__